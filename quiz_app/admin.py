@@ -5,7 +5,7 @@ from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth import get_user_model  # Get the active user model
 
 # Import your custom user model and roles
-from .models import CustomUser, Roles
+from .models import CustomUser, QuizAttempt, Roles
 
 # Get the custom user model
 CustomUser = get_user_model()
@@ -25,6 +25,12 @@ except Exception as e:
     print(f"Warning: Could not unregister default User model. {e}")
 
 
+# Fieldsets of the user forms: the stock ones plus our custom fields
+_CUSTOM_USER_FIELDSET = (None, {"fields": ("role", "is_marked")})
+_FIELDSETS = UserAdmin.fieldsets + (_CUSTOM_USER_FIELDSET,)
+_ADD_FIELDSETS = UserAdmin.add_fieldsets + (_CUSTOM_USER_FIELDSET,)
+
+
 class CustomUserAdmin(UserAdmin):
     """
     Custom Admin configuration for CustomUser model.
@@ -32,12 +38,10 @@ class CustomUserAdmin(UserAdmin):
     """
 
     # Add custom fields to the list of fields displayed on the user change form
-    fieldsets = UserAdmin.fieldsets + ((None, {"fields": ("role", "is_marked")}),)
+    fieldsets = _FIELDSETS
 
     # Add custom fields to the list of fields displayed on the user add form
-    add_fieldsets = UserAdmin.add_fieldsets + (
-        (None, {"fields": ("role", "is_marked")}),
-    )
+    add_fieldsets = _ADD_FIELDSETS
 
     # Specify the fields to be displayed in the user list page
     list_display = (
@@ -63,6 +67,44 @@ class CustomUserAdmin(UserAdmin):
     # Order by username by default
     ordering = ("username",)
 
+    # Join any related rows in the list query instead of fetching them per user
+    list_select_related = True
+
+    # Don't run an extra unfiltered COUNT(*) over the whole user table
+    # just to show the total next to filtered results
+    show_full_result_count = False
+
+    # Don't render every group/permission into the change form widgets:
+    # groups are looked up on demand and permissions are entered by ID
+    filter_horizontal = ()
+    autocomplete_fields = ("groups",)
+    raw_id_fields = ("user_permissions",)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The user list page only renders list_display, so skip loading
+        # the password hash and other unused columns there
+        match = request.resolver_match
+        if match is not None and match.url_name.endswith("_changelist"):
+            queryset = queryset.only("id", *self.list_display)
+        return queryset
+
 
 # Register the CustomUser model with the custom admin class
 admin.site.register(CustomUser, CustomUserAdmin)
+
+
+@admin.register(QuizAttempt)
+class QuizAttemptAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for QuizAttempt, listing the most recent attempts first.
+    """
+
+    list_display = ("id", "user", "quiz", "score", "submission_time")
+    list_filter = ("submission_time",)
+    search_fields = ("user__username", "quiz__title")
+    ordering = ("-submission_time",)
+
+    # user and quiz are rendered on every row, so join them in the list query
+    list_select_related = ("user", "quiz")
+    raw_id_fields = ("user", "quiz")
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='is_marked',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='role',
+            field=models.CharField(choices=[('ADMIN', 'Admin'), ('TEACHER', 'Teacher'), ('STUDENT', 'Student')], db_index=True, default='STUDENT', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['available_from', 'available_to'], name='quiz_app_qu_availab_ba7cb0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', 'quiz'], name='quiz_app_qu_user_id_20cbb0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['quiz', 'submission_time'], name='quiz_app_qu_quiz_id_4d8b2f_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:00
+
+from django.db import migrations, models
+
+
+def backfill_correct_option_ids(apps, schema_editor):
+    Question = apps.get_model("quiz_app", "Question")
+    AnswerOption = apps.get_model("quiz_app", "AnswerOption")
+    correct_ids_by_question = {}
+    for question_id, option_id in (
+        AnswerOption.objects.filter(is_correct=True)
+        .order_by("question_id", "id")
+        .values_list("question_id", "id")
+    ):
+        correct_ids_by_question.setdefault(question_id, []).append(option_id)
+    questions = list(Question.objects.only("id"))
+    for question in questions:
+        question.correct_option_ids = correct_ids_by_question.get(question.pk, [])
+    Question.objects.bulk_update(questions, ["correct_option_ids"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0002_add_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='correct_option_ids',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(backfill_correct_option_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0003_question_correct_option_ids'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participantanswer',
+            index=models.Index(fields=['attempt', 'is_correct'], name='quiz_app_pa_attempt_1968dc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participantanswer',
+            index=models.Index(condition=models.Q(('is_correct', True)), fields=['attempt'], name='pa_correct_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0004_participant_answer_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='quizattempt',
+            options={'ordering': ['-submission_time']},
+        ),
+        migrations.RemoveIndex(
+            model_name='quizattempt',
+            name='quiz_app_qu_quiz_id_4d8b2f_idx',
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['quiz', '-submission_time'], name='quiz_app_qu_quiz_id_c524be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', '-submission_time'], name='quiz_app_qu_user_id_0cac2e_idx'),
+        ),
+    ]
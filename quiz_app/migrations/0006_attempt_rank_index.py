@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0005_attempt_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['quiz', '-score', 'submission_time'], name='quiz_app_qu_quiz_id_c766f5_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0006_attempt_rank_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='quizattempt',
+            name='quiz_app_qu_user_id_20cbb0_idx',
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', 'quiz', 'submission_time'], name='quiz_app_qu_user_id_fc7b1e_idx'),
+        ),
+    ]
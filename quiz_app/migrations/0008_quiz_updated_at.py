@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0007_attempt_best_score_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -5,7 +5,20 @@ from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.core.validators import MinValueValidator
-from django.db.models import Sum, Max, OuterRef, Subquery
+from django.db.models import (
+    Sum,
+    Max,
+    Count,
+    Case,
+    When,
+    ExpressionWrapper,
+    OuterRef,
+    Subquery,
+    Prefetch,
+    Q,
+)
+from django.db.models.functions import Coalesce, Now
+from django.utils.functional import cached_property
 from django.db.models.constraints import UniqueConstraint
 
 
@@ -21,9 +34,30 @@ class QuestionTypes(models.TextChoices):
     TRUE_FALSE = "TRUE_FALSE", _("True/False")
 
 
+# Bit flags summarising a user's role and marked status, see CustomUser.role_flags
+ROLE_FLAG_ADMIN = 1
+ROLE_FLAG_TEACHER = 2
+ROLE_FLAG_STUDENT = 4
+ROLE_FLAG_MARKED = 8
+
+ROLE_FLAGS_BY_ROLE = {
+    Roles.ADMIN: ROLE_FLAG_ADMIN,
+    Roles.TEACHER: ROLE_FLAG_TEACHER,
+    Roles.STUDENT: ROLE_FLAG_STUDENT,
+}
+
+# How long the frontend's list of available quizzes may be served from the
+# cache. Display only: submissions always check availability afresh.
+AVAILABILITY_CACHE_SECONDS = 30
+
+
 class CustomUser(AbstractUser):
-    role = models.CharField(max_length=50, choices=Roles.choices, default=Roles.STUDENT)
-    is_marked = models.BooleanField(default=False)  # To indicate a banned student
+    role = models.CharField(
+        max_length=50, choices=Roles.choices, default=Roles.STUDENT, db_index=True
+    )
+    is_marked = models.BooleanField(
+        default=False, db_index=True
+    )  # To indicate a banned student
 
     # Add related_name to avoid clashes
     groups = models.ManyToManyField(
@@ -55,6 +89,17 @@ class CustomUser(AbstractUser):
     def is_student(self):
         return self.role == Roles.STUDENT
 
+    @cached_property
+    def role_flags(self):
+        """
+        Bitmask of ROLE_FLAG_* values, computed once per user instance so the
+        permission classes run on the same request can share it.
+        """
+        flags = ROLE_FLAGS_BY_ROLE.get(self.role, 0)
+        if self.is_marked:
+            flags |= ROLE_FLAG_MARKED
+        return flags
+
     def __str__(self):
         return self.username
 
@@ -69,6 +114,14 @@ class Quiz(models.Model):
     )  # Duration per attempt
     available_from = models.DateTimeField(null=True, blank=True)
     available_to = models.DateTimeField(null=True, blank=True)
+    # Bumped on every edit of the quiz or its questions, see quiz_etag()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Availability checks filter on both ends of the window
+            models.Index(fields=["available_from", "available_to"]),
+        ]
 
     def get_total_points(self):
         """
@@ -82,41 +135,84 @@ class Quiz(models.Model):
         return result.get("total_points") or 0.0
 
     # Optional: You can also add a property to access this method's result like an attribute
-    @property
+    # Cached per instance; listing views fill it in bulk with prefill_total_points()
+    @cached_property
     def total_points(self):
         return self.get_total_points()
 
+    @classmethod
+    def prefill_total_points(cls, quizzes):
+        """
+        Sets `total_points` on each of `quizzes` with a single grouped query,
+        instead of one SUM query per quiz when a listing renders it.
+        """
+        quizzes = list(quizzes)
+        totals = dict(
+            Question.objects.filter(quiz__in={quiz.pk for quiz in quizzes})
+            .values("quiz")
+            .annotate(total=Sum("points"))
+            .values_list("quiz", "total")
+        )
+        for quiz in quizzes:
+            quiz.total_points = totals.get(quiz.pk) or 0.0
+
     @property
     def has_availability_window(self):
         return self.available_from is not None and self.available_to is not None
 
-    @property
+    def _compute_available(self, now):
+        """
+        Available if no window is set, or if `now` falls inside the window.
+        A missing `available_from` or `available_to` leaves that side open.
+        """
+        return (self.available_from is None or self.available_from <= now) and (
+            self.available_to is None or now <= self.available_to
+        )
+
+    @staticmethod
+    def available_list_cache_key(now=None):
+        # One key for the frontend's list of open quizzes per time bucket
+        now = now or timezone.now()
+        bucket = int(now.timestamp() // AVAILABILITY_CACHE_SECONDS)
+        return f"q:avail-list:{bucket}"
+
+    @cached_property
     def is_available_for_submission(self):
-        now = timezone.now()
-        if self.has_availability_window:
-            # Check if current time is within the window
-            return self.available_from <= now <= self.available_to
-        else:
-            # No window means always available until manually closed/removed,
-            # or perhaps better, always available for submission *unless* the window has passed.
-            # Let's interpret 'no window' as 'always open for submission'.
-            # If we want 'always open until manually closed', we need another flag.
-            # Sticking to the prompt: no window means available, window means check time.
-            # Alternative interpretation: 'available_to' being null means it's available forever from 'available_from'.
-            # Let's use the prompt's interpretation: `has_availability_window` checks if *both* are set. If not both, it's considered "no window", meaning it's available.
-            # Refined logic: Available if NO window set OR current time is within the window.
-            if self.available_from is None and self.available_to is None:
-                return True  # No window, always available
-            elif self.available_from is not None and self.available_to is not None:
-                return self.available_from <= now <= self.available_to
-            elif self.available_from is not None and self.available_to is None:
-                return (
-                    self.available_from <= now
-                )  # Available from a certain time, no end
-            elif self.available_from is None and self.available_to is not None:
-                return (
-                    now <= self.available_to
-                )  # Available until a certain time, no start
+        """
+        Whether the quiz currently accepts submissions (see `_compute_available`).
+        Always decided against the current time, never a shared cached value, so
+        a quiz stops accepting submissions exactly at `available_to`. Cached on
+        the instance only, so repeated checks within a request are free.
+        """
+        return self._compute_available(timezone.now())
+
+    @staticmethod
+    def _available_q():
+        # The rules of `_compute_available`, with the database's current time
+        return (Q(available_from__isnull=True) | Q(available_from__lte=Now())) & (
+            Q(available_to__isnull=True) | Q(available_to__gte=Now())
+        )
+
+    @classmethod
+    def available_qs(cls):
+        """
+        Quizzes currently available for submission, using the same rules as
+        `is_available_for_submission` but evaluated by the database.
+        """
+        return cls.objects.filter(cls._available_q())
+
+    @classmethod
+    def annotate_availability(cls, queryset):
+        """
+        Lets the database compute `is_available_for_submission` while listing.
+        The annotation is stored under the cached property's name, so reading
+        the property on a fetched quiz costs no Python comparison per row.
+        """
+        return queryset.annotate(
+            is_available_for_submission=ExpressionWrapper(
+                cls._available_q(), output_field=models.BooleanField()
+            )
+        )
 
     def __str__(self):
         return self.title
@@ -130,15 +226,36 @@ class Question(models.Model):
     correct_answer_bool = models.BooleanField(
         null=True, blank=True
     )  # For True/False questions
+    # IDs of the correct AnswerOptions, kept in sync by the signals in
+    # quiz_app/signals.py so grading doesn't have to query answer_options
+    correct_option_ids = models.JSONField(default=list, blank=True, editable=False)
+
+    @classmethod
+    def refresh_correct_option_ids(cls, question_id):
+        """
+        Recomputes the denormalized `correct_option_ids` of one question from its
+        answer options. Call this after changing options without signals
+        (e.g. bulk_create or queryset.update()).
+        """
+        correct_ids = list(
+            AnswerOption.objects.filter(question_id=question_id, is_correct=True)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        cls.objects.filter(pk=question_id).update(correct_option_ids=correct_ids)
+        return correct_ids
 
-    def get_correct_answer_options(self):
+    def store_correct_option_ids(self, options):
         """
-        Returns a queryset of correct AnswerOption objects for this question.
-        This method can be called from templates.
+        Stores `correct_option_ids` from an already loaded, complete list of this
+        question's options, e.g. right after bulk-creating them.
         """
-        return self.answer_options.filter(
-            is_correct=True
-        )  # Use filter here (in Python)
+        self.correct_option_ids = sorted(
+            option.pk for option in options if option.is_correct
+        )
+        Question.objects.filter(pk=self.pk).update(
+            correct_option_ids=self.correct_option_ids
+        )
 
     def __str__(self):
         return f"Q: {self.text[:50]}... ({self.quiz.title})"
@@ -163,16 +280,132 @@ class QuizAttempt(models.Model):
     score = models.FloatField(default=0.0)  # Calculated upon submission
     submission_time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Most recent attempt first
+        ordering = ["-submission_time"]
+        indexes = [
+            # Attempts of a user on a quiz in submission order (best score
+            # lookups: the max score, or the score of the first attempt)
+            models.Index(fields=["user", "quiz", "submission_time"]),
+            # Attempts of a quiz / of a user, most recent first
+            models.Index(fields=["quiz", "-submission_time"]),
+            models.Index(fields=["user", "-submission_time"]),
+            # Leaderboard order within a quiz, used to count attempts ranked above
+            models.Index(fields=["quiz", "-score", "submission_time"]),
+        ]
+
+    def grade(self):
+        """
+        Grades all participant answers of this attempt in one batch and then
+        recalculates the score. Used after a submission has been stored.
+        """
+        ParticipantAnswer.grade_many(self.participant_answers.all())
+        self.calculate_score()
+
     def calculate_score(self):
         """
         Calculates the total score for the attempt based on the correctness
         of participant answers. Assumes participant_answer.is_correct is already set.
         """
-        total_score = 0.0
-        for participant_answer in self.participant_answers.filter(is_correct=True):
-            total_score += participant_answer.question.points
+        # Let the database join question points and sum them in one query
+        total_score = (
+            self.participant_answers.filter(is_correct=True).aggregate(
+                total=Sum("question__points")
+            )["total"]
+            or 0.0
+        )
+        # Only the score column changes, so skip rewriting the whole row
+        QuizAttempt.objects.filter(pk=self.pk).update(score=total_score)
         self.score = total_score
-        self.save()
+
+    @classmethod
+    def annotate_rank(cls, queryset):
+        """
+        Annotates `rank_value` on each attempt: 1 + the number of attempts on the
+        same quiz with a higher score, or the same score submitted earlier.
+        Computed by the database as part of the listing query. A correlated
+        subquery is used rather than a RANK() window, because a window would only
+        rank the rows left after the queryset's own filters (e.g. a student's
+        attempts, or the single row fetched by a detail view).
+
+        The subquery is answered from the (quiz, -score, submission_time) index
+        alone: it only filters on those columns and counts rows, not primary keys.
+        """
+        ranked_above = (
+            cls.objects.filter(quiz=OuterRef("quiz"))
+            .filter(
+                Q(score__gt=OuterRef("score"))
+                | Q(
+                    score=OuterRef("score"),
+                    submission_time__lt=OuterRef("submission_time"),
+                )
+            )
+            .order_by()
+            .values("quiz")
+            # COUNT(*) rather than COUNT(id) keeps the scan index-only
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return queryset.annotate(
+            rank_value=Coalesce(
+                Subquery(ranked_above, output_field=models.IntegerField()), 0
+            )
+            + 1
+        )
+
+    @classmethod
+    def annotate_best_score(cls, queryset):
+        """
+        Annotates `best_score` on each attempt: the user's best score on the quiz.
+        Timed quizzes use the max score across the user's attempts, untimed quizzes
+        the score of the user's first attempt. A correlated subquery (rather than
+        a window) keeps it correct when the queryset itself is filtered.
+        """
+        # Each rule is a plain walk of the (user, quiz, submission_time) index; the
+        # outer row's quiz picks which one applies, so the subqueries themselves
+        # neither join the quiz nor sort by a computed key
+        siblings = cls.objects.filter(
+            user=OuterRef("user"), quiz=OuterRef("quiz")
+        ).order_by()
+        max_score = siblings.values("quiz").annotate(best=Max("score")).values("best")
+        first_score = siblings.order_by("submission_time").values("score")[:1]
+        return queryset.annotate(
+            best_score=Coalesce(
+                Case(
+                    When(quiz__timing_minutes__gt=0, then=Subquery(max_score)),
+                    default=Subquery(first_score),
+                ),
+                0.0,
+                output_field=models.FloatField(),
+            )
+        )
+
+    @classmethod
+    def annotate_leaderboard(cls, queryset):
+        """Annotates both `rank_value` and `best_score`, see the methods above."""
+        return cls.annotate_best_score(cls.annotate_rank(queryset))
+
+    @classmethod
+    def recalculate_bulk(cls, attempt_ids):
+        """
+        Recalculates the score of many attempts at once: one GROUP BY query for
+        the totals and a single bulk_update to persist them.
+        Returns the list of updated attempts.
+        """
+        totals = dict(
+            ParticipantAnswer.objects.filter(
+                attempt_id__in=attempt_ids, is_correct=True
+            )
+            .values("attempt_id")
+            .annotate(total=Sum("question__points"))
+            .values_list("attempt_id", "total")
+        )
+        attempts = list(cls.objects.filter(pk__in=attempt_ids).only("id", "score"))
+        for attempt in attempts:
+            # Attempts without any correct answer are absent from the GROUP BY
+            attempt.score = totals.get(attempt.pk) or 0.0
+        cls.objects.bulk_update(attempts, ["score"])
+        return attempts
 
     def __str__(self):
         return (
@@ -180,6 +413,15 @@ class QuizAttempt(models.Model):
         )
 
 
+# Question columns read by ParticipantAnswer.determine_correctness()
+GRADING_QUESTION_FIELDS = (
+    "question__id",
+    "question__question_type",
+    "question__correct_answer_bool",
+    "question__correct_option_ids",
+)
+
+
 class ParticipantAnswer(models.Model):
     attempt = models.ForeignKey(
         QuizAttempt, on_delete=models.CASCADE, related_name="participant_answers"
@@ -200,11 +442,67 @@ class ParticipantAnswer(models.Model):
                 fields=["attempt", "question"], name="unique_participant_answer"
             )
         ]
+        # The question FK already has its own index
+        indexes = [
+            # Correct/incorrect answers of an attempt
+            models.Index(fields=["attempt", "is_correct"]),
+            # Only the correct answers of an attempt, as summed by calculate_score()
+            models.Index(
+                fields=["attempt"],
+                condition=Q(is_correct=True),
+                name="pa_correct_idx",
+            ),
+        ]
+
+    @classmethod
+    def grade_many(cls, queryset):
+        """
+        Grades every participant answer in `queryset` with a fixed number of queries:
+        correct option IDs come with the joined question row, selected options
+        are prefetched once instead of per answer, and the results are written
+        back with a single bulk_update.
+        Returns the list of graded answers.
+        """
+        participant_answers = list(
+            queryset.select_related("question")
+            # Skip the question text and other columns grading never reads
+            .only(
+                "id",
+                "attempt_id",
+                "selected_answer_bool",
+                "is_correct",
+                *GRADING_QUESTION_FIELDS,
+            )
+            .prefetch_related(
+                Prefetch(
+                    "selected_options",
+                    queryset=AnswerOption.objects.only("id"),
+                    to_attr="_selected",
+                ),
+            )
+        )
+        for participant_answer in participant_answers:
+            participant_answer.determine_correctness()
+        cls.objects.bulk_update(
+            participant_answers, ["is_correct"], batch_size=10_000
+        )
+        return participant_answers
+
+    def _get_correct_option_ids(self):
+        # Denormalized onto the question, so no answer_options query is needed
+        return set(self.question.correct_option_ids)
+
+    def _get_selected_option_ids(self):
+        # Use the options prefetched by grade_many() when available
+        if hasattr(self, "_selected"):
+            return {option.id for option in self._selected}
+        return set(self.selected_options.values_list("id", flat=True))
 
     def determine_correctness(self):
         """
         Determines if the participant's answer is correct based on the question type
-        and selected options/boolean. Sets the `is_correct` field.
+        and selected options/boolean. Sets the `is_correct` field in memory only;
+        persisting it is left to grade_many(), which writes all answers at once.
         """
         correct = False
         question_type = self.question.question_type
@@ -214,15 +512,9 @@ class ParticipantAnswer(models.Model):
             or question_type == QuestionTypes.MULTI_MCQ
         ):
             # Get the IDs of correct options for the question
-            correct_option_ids = set(
-                self.question.answer_options.filter(is_correct=True).values_list(
-                    "id", flat=True
-                )
-            )
+            correct_option_ids = self._get_correct_option_ids()
             # Get the IDs of options selected by the participant
-            selected_option_ids = set(
-                self.selected_options.values_list("id", flat=True)
-            )
+            selected_option_ids = self._get_selected_option_ids()
 
             if question_type == QuestionTypes.SINGLE_MCQ:
                 # For Single MCQ, correct if exactly one option is selected AND that option is the correct one.
@@ -262,7 +554,6 @@ class ParticipantAnswer(models.Model):
                 correct = False  # One is None, the other isn't
 
         self.is_correct = correct
-        self.save()  # Save the correctness status
 
         return self.is_correct
 
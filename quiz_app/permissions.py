@@ -1,6 +1,23 @@
 # quiz_app/permissions.py
 from rest_framework.permissions import BasePermission, IsAuthenticated, IsAdminUser
-from .models import Roles
+from .models import (
+    Roles,
+    ROLE_FLAG_ADMIN,
+    ROLE_FLAG_TEACHER,
+    ROLE_FLAG_STUDENT,
+    ROLE_FLAG_MARKED,
+)
+
+# Plain role strings, resolved once at import time. CustomUser.role stores the
+# raw value, so checks against these are simple str comparisons.
+_ADMIN = Roles.ADMIN.value
+_TEACHER = Roles.TEACHER.value
+_STUDENT = Roles.STUDENT.value
+
+
+def _role_flags(request):
+    # Anonymous users have no role_flags, which denies every role check below
+    return getattr(request.user, "role_flags", 0)
 
 
 class IsTeacherOrAdmin(BasePermission):
@@ -9,11 +26,7 @@ class IsTeacherOrAdmin(BasePermission):
     """
 
     def has_permission(self, request, view):
-        return (
-            request.user
-            and request.user.is_authenticated
-            and (request.user.role == Roles.TEACHER or request.user.role == Roles.ADMIN)
-        )
+        return bool(_role_flags(request) & (ROLE_FLAG_TEACHER | ROLE_FLAG_ADMIN))
 
 
 class IsStudent(BasePermission):
@@ -22,11 +35,7 @@ class IsStudent(BasePermission):
     """
 
     def has_permission(self, request, view):
-        return (
-            request.user
-            and request.user.is_authenticated
-            and request.user.role == Roles.STUDENT
-        )
+        return bool(_role_flags(request) & ROLE_FLAG_STUDENT)
 
 
 class IsMarkedStudent(BasePermission):
@@ -36,14 +45,9 @@ class IsMarkedStudent(BasePermission):
     """
 
     def has_permission(self, request, view):
-        # Check if the user is authenticated and is a student
-        if not (
-            request.user and request.user.is_authenticated and request.user.is_student()
-        ):
-            return False  # Not authenticated or not a student
-
-        # Check if the student is marked
-        return request.user.is_marked
+        # Must be a student AND marked
+        mask = ROLE_FLAG_STUDENT | ROLE_FLAG_MARKED
+        return _role_flags(request) & mask == mask
 
     # object-level permission not needed for this check
 
@@ -54,14 +58,9 @@ class IsNotMarkedStudent(BasePermission):
     """
 
     def has_permission(self, request, view):
-        # Check if the user is authenticated and is a student
-        if not (
-            request.user and request.user.is_authenticated and request.user.is_student()
-        ):
-            return False  # Not authenticated or not a student
-
-        # Check if the student is NOT marked
-        return not request.user.is_marked  # This is the key difference
+        # Must be a student and NOT marked
+        mask = ROLE_FLAG_STUDENT | ROLE_FLAG_MARKED
+        return _role_flags(request) & mask == ROLE_FLAG_STUDENT
 
     # object-level permission not needed for this check
 
@@ -75,9 +74,10 @@ class IsQuizTeacherOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         # Assuming 'obj' is a Quiz instance
         if request.user and request.user.is_authenticated:
-            if request.user.role == Roles.ADMIN:
+            role = request.user.role
+            if role == _ADMIN:
                 return True  # Admin can do anything
-            if request.user.role == Roles.TEACHER and obj.teacher == request.user:
+            if role == _TEACHER and obj.teacher_id == request.user.id:
                 return True  # Teacher can manage their own quizzes
         return False
 
@@ -86,15 +86,30 @@ class IsAttemptOwnerOrTeacherOrAdmin(BasePermission):
     """
     Allows access only to the owner of the attempt, the teacher of the quiz, or an Admin.
     Applies to object-level permissions for QuizAttempt.
+    Views should pass their attempt queryset through `apply_queryset_hints()`
+    so the relations used here are joined instead of fetched per attempt.
     """
 
+    @classmethod
+    def apply_queryset_hints(cls, queryset):
+        return queryset.select_related("user", "quiz__teacher")
+
     def has_object_permission(self, request, view, obj):
         # Assuming 'obj' is a QuizAttempt instance
-        if request.user and request.user.is_authenticated:
-            if request.user.role == Roles.ADMIN:
-                return True  # Admin can do anything
-            if request.user.role == Roles.TEACHER and obj.quiz.teacher == request.user:
-                return True  # Teacher can view attempts for their quizzes
-            if request.user.role == Roles.STUDENT and obj.user == request.user:
-                return True  # Student can view their own attempts
-        return False
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+        check = _ATTEMPT_ACCESS_BY_ROLE.get(user.role)
+        return check is not None and check(user, obj)
+
+
+# Object-level access to a QuizAttempt, keyed by role. Foreign key ids are
+# compared so no related row needs to be loaded.
+_ATTEMPT_ACCESS_BY_ROLE = {
+    # Admin can do anything
+    _ADMIN: lambda user, attempt: True,
+    # Teacher can view attempts for their quizzes
+    _TEACHER: lambda user, attempt: attempt.quiz.teacher_id == user.id,
+    # Student can view their own attempts
+    _STUDENT: lambda user, attempt: attempt.user_id == user.id,
+}
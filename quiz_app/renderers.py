@@ -0,0 +1,27 @@
+# quiz_app/renderers.py
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Values orjson can't encode natively (lazy translation strings in error
+# messages, Decimals, ...) are converted the same way DRF's encoder does
+_fallback_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes responses with orjson instead of the stdlib json
+    module. Output matches the compact form DRF renders by default.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # orjson only supports a two-space indent, so leave requests for other
+        # formatting (e.g. `Accept: application/json; indent=4`) to DRF
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Validation errors of list fields are keyed by the int index of the item
+        return orjson.dumps(
+            data, default=_fallback_default, option=orjson.OPT_NON_STR_KEYS
+        )
@@ -2,9 +2,11 @@
 
 from django.db import transaction
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 # Import the necessary serializers module
 from rest_framework import serializers
+from rest_framework.fields import SkipField
 
 # Import necessary models and Roles Enum, and QuestionTypes Enum
 from .models import (
@@ -17,26 +19,13 @@ from .models import (
     Roles,
     QuestionTypes,
 )
+from .signals import skip_correct_option_ids_refresh, skip_quiz_touch
 
 # Imports needed for result serializers' calculations
-from django.db.models import Max, Q  # Import Q for complex filtering
+from django.db.models import Max, Prefetch, Q  # Import Q for complex filtering
 # Consider importing F and Q objects if complex queries are needed in serializers
 # from django.db.models import F
 
-# Imports needed for rank calculation (if using Window functions - requires Django 3.2+)
-from django.db.models import Window
-from django.db.models.functions import Rank  # Note: Rank is a Window function
-
-
-# Helper to get QuestionTypes Enum member from string value
-# Create a dictionary mapping the string value of each Enum member to the member itself
-QUESTION_TYPE_ENUM_MAP = {member.value: member for member in QuestionTypes}
-
-
-def get_question_type_enum_from_string(value_string):
-    """Looks up a QuestionTypes Enum member based on its string value."""
-    return QUESTION_TYPE_ENUM_MAP.get(value_string)
-
 
 # --- Basic Serializers ---
 
@@ -84,8 +73,10 @@ class AnswerOptionSerializer(serializers.ModelSerializer):
 # This is the read-only serializer for Question used in QuizReadOnlySerializer and ParticipantAnswerResultSerializer
 # Depends on AnswerOptionSerializer
 class QuestionReadOnlySerializer(serializers.ModelSerializer):
-    # Use AnswerOptionSerializer here which now correctly hides is_correct
-    answer_options = AnswerOptionSerializer(many=True, read_only=True)
+    # Same output as AnswerOptionSerializer(many=True) (is_correct stays hidden),
+    # but built as plain dicts from the prefetched options instead of running
+    # DRF's field machinery for every option
+    answer_options = serializers.SerializerMethodField()
 
     class Meta:
         model = Question
@@ -93,6 +84,25 @@ class QuestionReadOnlySerializer(serializers.ModelSerializer):
         # FIX: read_only_fields must be a list or tuple
         read_only_fields = fields
 
+    def get_answer_options(self, obj):
+        return [{"id": o.id, "text": o.text} for o in obj.answer_options.all()]
+
+    @staticmethod
+    def represent(question):
+        """
+        Plain-dict equivalent of this serializer's output, used to render the
+        many questions of a quiz without a serializer pass per question.
+        """
+        return {
+            "id": question.id,
+            "question_type": question.question_type,
+            "text": question.text,
+            "points": question.points,
+            "answer_options": [
+                {"id": o.id, "text": o.text} for o in question.answer_options.all()
+            ],
+        }
+
 
 # --- Writable Nested Serializers ---
 
@@ -124,13 +134,107 @@ class QuizAnswerOptionWritableSerializer(serializers.ModelSerializer):
         return data
 
 
+# --- Per-question-type validation for QuizQuestionWritableSerializer.validate ---
+# Each validator takes (serializer, data) and raises ValidationError on the
+# constraints of its own type only.
+
+
+def _is_required(serializer, data, field_name):
+    # A field is required on create, or on update when its key is present in data
+    return serializer.instance is None or field_name in data
+
+
+def _validated_mcq_options(serializer, data):
+    """
+    Checks shared by both MCQ types. Returns the validated answer options list,
+    or None if it wasn't provided on update.
+    """
+    question_type = data.get("question_type")
+    answer_options = data.get("answer_options")
+
+    # Check for correct_answer_bool presence when it shouldn't exist
+    if data.get("correct_answer_bool") is not None:
+        raise serializers.ValidationError(
+            {
+                "correct_answer_bool": f"{question_type} questions should not have correct_answer_bool."
+            }
+        )
+    # Require answer_options on create or if explicitly provided in update data
+    if answer_options is None and _is_required(serializer, data, "answer_options"):
+        raise serializers.ValidationError(
+            {"answer_options": f"{question_type} questions must have answer options."}
+        )
+    if answer_options is not None and not answer_options:
+        raise serializers.ValidationError(
+            {"answer_options": "MCQ questions must have answer options."}
+        )
+    return answer_options
+
+
+def _has_exactly_one_correct(answer_options):
+    seen_correct = False
+    for opt in answer_options:
+        if opt.get("is_correct", False):
+            if seen_correct:
+                return False  # Stop at the second correct option
+            seen_correct = True
+    return seen_correct
+
+
+def _validate_single_mcq(serializer, data):
+    answer_options = _validated_mcq_options(serializer, data)
+    if answer_options is not None and not _has_exactly_one_correct(answer_options):
+        raise serializers.ValidationError(
+            "Single MCQ must have exactly one correct answer."
+        )
+
+
+def _validate_multi_mcq(serializer, data):
+    answer_options = _validated_mcq_options(serializer, data)
+    # Any one correct option is enough
+    if answer_options is not None and not any(
+        opt.get("is_correct", False) for opt in answer_options
+    ):
+        raise serializers.ValidationError(
+            "Multi MCQ must have at least one correct answer."
+        )
+
+
+def _validate_true_false(serializer, data):
+    question_type = data.get("question_type")
+    # Check for answer_options presence when it shouldn't exist
+    if data.get("answer_options") is not None:
+        raise serializers.ValidationError(
+            {
+                "answer_options": f"{question_type} questions should not have answer options."
+            }
+        )
+    # Require correct_answer_bool on create or if present in update data
+    if data.get("correct_answer_bool") is None and _is_required(
+        serializer, data, "correct_answer_bool"
+    ):
+        raise serializers.ValidationError(
+            {
+                "correct_answer_bool": f"{question_type} questions must specify correct_answer_bool (true/false)."
+            }
+        )
+
+
+_QUESTION_TYPE_VALIDATORS = {
+    QuestionTypes.SINGLE_MCQ: _validate_single_mcq,
+    QuestionTypes.MULTI_MCQ: _validate_multi_mcq,
+    QuestionTypes.TRUE_FALSE: _validate_true_false,
+}
+
+
 # This is the writable serializer for Question used in QuizWritableSerializer
 # Depends on QuizAnswerOptionWritableSerializer
 class QuizQuestionWritableSerializer(serializers.ModelSerializer):
     """
     Writable serializer for Question, includes nested AnswerOptions.
     Overrides create/update to handle nested answer options and set the 'quiz' FK.
-    This is where the answer_options.set() logic for updates lives.
+    Nested options are written in bulk: one INSERT on create, and on update one
+    delete, one upsert and one INSERT regardless of the number of options.
     """
 
     # Define nested options using the writable serializer
@@ -156,20 +260,10 @@ class QuizQuestionWritableSerializer(serializers.ModelSerializer):
         }
 
     # --- Refactored Validation ---
-    # Consolidate all validation logic here in the main validate method
+    # Type-specific rules live in the module-level _QUESTION_TYPE_VALIDATORS
+    # dispatch table; the checks shared by every type stay here
     def validate(self, data):
-        # Get all necessary fields from the 'data' dictionary passed to validate
         question_type = data.get("question_type")
-        answer_options = data.get(
-            "answer_options"
-        )  # This is the validated list of option data
-        correct_answer_bool = data.get("correct_answer_bool")  # Check if it's in data
-
-        # Convert string question_type to Enum using the helper
-        # Use the helper function defined at the top
-        question_type_enum = get_question_type_enum_from_string(question_type)
-
-        # --- Check field requirements based on create/update (self.instance) and data presence ---
 
         # Require question_type on create
         if question_type is None and self.instance is None:
@@ -177,82 +271,16 @@ class QuizQuestionWritableSerializer(serializers.ModelSerializer):
                 {"question_type": "This field is required."}
             )
 
-        # If question_type is provided, validate its relation to other fields
-        if question_type_enum:  # Check if a valid enum member was found
-            if question_type_enum in [
-                QuestionTypes.SINGLE_MCQ,
-                QuestionTypes.MULTI_MCQ,
-            ]:
-                # Check for correct_answer_bool presence when it shouldn't exist
-                if correct_answer_bool is not None:
-                    raise serializers.ValidationError(
-                        {
-                            "correct_answer_bool": f"{question_type} questions should not have correct_answer_bool."
-                        }
-                    )
-                # Require answer_options on create or if explicitly provided in update data
-                # If it's create OR (it's update AND 'answer_options' key is present in data)
-                if answer_options is None and (
-                    self.instance is None or "answer_options" in data
-                ):
-                    raise serializers.ValidationError(
-                        {
-                            "answer_options": f"{question_type} questions must have answer options."
-                        }
-                    )
-
-                # Validate content of answer options list (counts, correct answers)
-                if (
-                    answer_options is not None
-                ):  # Only check if answer_options data was provided
-                    if not answer_options:
-                        raise serializers.ValidationError(
-                            {
-                                "answer_options": "MCQ questions must have answer options."
-                            }
-                        )
-
-                    correct_count = sum(
-                        opt.get("is_correct", False) for opt in answer_options
-                    )
-
-                    if (
-                        question_type_enum == QuestionTypes.SINGLE_MCQ
-                        and correct_count != 1
-                    ):
-                        raise serializers.ValidationError(
-                            "Single MCQ must have exactly one correct answer."
-                        )
-
-                    if (
-                        question_type_enum == QuestionTypes.MULTI_MCQ
-                        and correct_count < 1
-                    ):
-                        raise serializers.ValidationError(
-                            "Multi MCQ must have at least one correct answer."
-                        )
-
-            elif question_type_enum == QuestionTypes.TRUE_FALSE:
-                # Check for answer_options presence when it shouldn't exist
-                if answer_options is not None:
-                    raise serializers.ValidationError(
-                        {
-                            "answer_options": f"{question_type} questions should not have answer options."
-                        }
-                    )
-                # Require correct_answer_bool on create or if present in update data
-                # If it's create OR (it's update AND 'correct_answer_bool' key is present in data)
-                if correct_answer_bool is None and (
-                    self.instance is None or "correct_answer_bool" in data
-                ):
-                    raise serializers.ValidationError(
-                        {
-                            "correct_answer_bool": f"{question_type} questions must specify correct_answer_bool (true/false)."
-                        }
-                    )
-            # If question_type is provided but not recognized, this case is handled by DRF default validation
-            # If question_type is provided but doesn't map to a known enum value, get_question_type_enum_from_string returns None,
-            # and the outer `if question_type_enum:` block is skipped. This is handled implicitly by default validation on the field itself.
+        # Convert string question_type to Enum; the Enum's own value lookup
+        # is a cached O(1) map, so no helper is needed. An unrecognized type
+        # has no validator here and is handled by DRF's field validation.
+        try:
+            question_type_enum = QuestionTypes(question_type)
+        except ValueError:
+            question_type_enum = None
+        type_validator = _QUESTION_TYPE_VALIDATORS.get(question_type_enum)
+        if type_validator is not None:
+            type_validator(self, data)
 
         # Check text requirement
         # If it's create OR (it's update AND 'text' key is present in data)
@@ -275,6 +303,21 @@ class QuizQuestionWritableSerializer(serializers.ModelSerializer):
 
         return data
 
+    @staticmethod
+    def build_answer_options(question, answer_options_data):
+        """
+        Unsaved AnswerOption instances for already validated option data,
+        ready to be passed to bulk_create().
+        """
+        return [
+            AnswerOption(
+                question=question,  # Set the 'question' FK
+                text=option_data["text"],
+                is_correct=option_data.get("is_correct", False),
+            )
+            for option_data in answer_options_data
+        ]
+
     @transaction.atomic  # Ensure atomicity for question and its options
     def create(self, validated_data):
         # Override create to handle nested answer options and set the 'quiz' FK
@@ -289,16 +332,15 @@ class QuizQuestionWritableSerializer(serializers.ModelSerializer):
             **validated_data
         )  # 'quiz' FK is set here
 
-        # Manually create answer options for the new question
-        # No need to call .set() during initial creation, saving the option with the FK is sufficient.
-        for option_data in answer_options_data:
-            # AnswerOption serializer handles its own validation
-            option_serializer = QuizAnswerOptionWritableSerializer(data=option_data)
-            option_serializer.is_valid(raise_exception=True)
-            # Create the AnswerOption instance, setting the 'question' FK
-            option_serializer.save(
-                question=question_instance
-            )  # Pass question to set FK
+        # Create all answer options for the new question in one INSERT.
+        # The option data was already validated by QuizAnswerOptionWritableSerializer
+        # as part of this serializer's nested validation, so it isn't re-run here.
+        answer_options = AnswerOption.objects.bulk_create(
+            self.build_answer_options(question_instance, answer_options_data)
+        )
+        # bulk_create() doesn't send post_save, so store the correct option IDs here
+        if answer_options:
+            question_instance.store_correct_option_ids(answer_options)
 
         # Returning the instance after saving.
         return question_instance
@@ -322,57 +364,84 @@ class QuizQuestionWritableSerializer(serializers.ModelSerializer):
         if (
             answer_options_data is not None
         ):  # Process options only if data is provided in request
-            existing_options = {str(o.pk): o for o in instance.answer_options.all()}
-            incoming_options_map = {
-                str(o.get("id")): o for o in answer_options_data if o.get("id")
-            }
+            (options,) = self.sync_answer_options([(instance, answer_options_data)])
+            # Bulk writes don't send signals, so store the correct option IDs here
+            instance.store_correct_option_ids(options)
 
-            # Determine which existing options are NOT in the incoming data (to delete)
-            options_to_delete = [
-                option
-                for pk, option in existing_options.items()
-                if pk not in incoming_options_map
-            ]
-
-            # Delete options not in incoming data for THIS question
-            if options_to_delete:
-                # Use a list() to evaluate the queryset before deleting to avoid issues
-                instance.answer_options.filter(
-                    id__in=[opt.id for opt in options_to_delete]
-                ).delete()
+        return instance
 
-            processed_option_instances = []  # Collect updated/created question instances
+    @classmethod
+    def sync_answer_options(cls, options_data_per_question):
+        """
+        Replaces the options of several questions with the incoming option data,
+        given as (question, answer_options_data) pairs. Options with a known ID are
+        updated, the others are created and options missing from the data are
+        deleted, using one delete, one upsert and one INSERT for all questions.
+        correct_option_ids isn't refreshed, so callers store it for the questions.
 
-            # Process incoming answer options for THIS question
+        Returns the resulting list of options of each question, in input order.
+        """
+        kept_option_ids = []
+        options_to_update = []
+        options_to_create = []
+        options_per_question = []
+        for question, answer_options_data in options_data_per_question:
+            # Reads the prefetch cache when the caller prefetched answer_options
+            existing_options = {o.pk: o for o in question.answer_options.all()}
+
+            # Partition the incoming options into updates of existing options of
+            # THIS question and new options to create
+            options = []
             for option_data in answer_options_data:
-                option_id = option_data.get("id")
-                existing_option = (
-                    existing_options.get(str(option_id)) if option_id else None
-                )
-
-                # Use the nested AnswerOption serializer to update or create the option instance
-                option_serializer = QuizAnswerOptionWritableSerializer(
-                    instance=existing_option,  # Pass existing instance for update or None for create
-                    data=option_data,  # Data for the option
-                    partial=True,  # Allow partial updates
-                    # context={'request': self.context.get('request')}
-                )
-                option_serializer.is_valid(raise_exception=True)
-                # Call the nested serializer's save method, explicitly setting the 'question' FK to THIS question instance
-                processed_option_instance = option_serializer.save(
-                    question=instance
-                )  # Pass question instance
-
-                processed_option_instances.append(processed_option_instance)
-
-            # --- FIX: Use .set() to update answer_options for THIS question ---
-            # After processing all options for this question, use .set() to update the relationship.
-            # This replaces the question's answer_options with the updated/created set.
-            # This was the crucial line the error message indicated was needed during update.
-            instance.answer_options.set(processed_option_instances)
-            # No need to save instance (Question) after .set() for ManyToOne/OneToMany.
+                existing_option = existing_options.get(option_data.get("id"))
+                if existing_option is not None:
+                    # Partial update: only change the fields that were sent, and
+                    # only rewrite the row when one of them actually differs
+                    changed = False
+                    for attr in ("text", "is_correct"):
+                        if (
+                            attr in option_data
+                            and getattr(existing_option, attr) != option_data[attr]
+                        ):
+                            setattr(existing_option, attr, option_data[attr])
+                            changed = True
+                    if changed:
+                        options_to_update.append(existing_option)
+                    kept_option_ids.append(existing_option.pk)
+                    options.append(existing_option)
+                else:
+                    options.extend(cls.build_answer_options(question, [option_data]))
+            options_to_create.extend(
+                option for option in options if option.pk is None
+            )
+            options_per_question.append(options)
+
+        # Delete options not in incoming data of these questions, together with
+        # their selection rows in participant answers. Callers store the
+        # questions' correct_option_ids and move the quiz's updated_at, so the
+        # per-option signal work is skipped.
+        with skip_correct_option_ids_refresh(), skip_quiz_touch():
+            AnswerOption.objects.filter(
+                question__in=[question for question, _ in options_data_per_question]
+            ).exclude(id__in=kept_option_ids).delete()
+
+        # Write the remaining changes with one upsert and one INSERT. The FK of
+        # every option already points at its question, so no .set() is needed.
+        # The kept options are complete rows, so INSERT ... ON CONFLICT (id) DO
+        # UPDATE rewrites them in a statement linear in the number of rows,
+        # unlike bulk_update()'s CASE WHEN id = ... branch per row and column.
+        if options_to_update:
+            AnswerOption.objects.bulk_create(
+                options_to_update,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=["text", "is_correct"],
+                batch_size=1000,
+            )
+        if options_to_create:
+            AnswerOption.objects.bulk_create(options_to_create, batch_size=1000)
 
-        return instance
+        return options_per_question
 
 
 # --- Top-Level Read-Only Serializers ---
@@ -382,7 +451,8 @@ class QuizQuestionWritableSerializer(serializers.ModelSerializer):
 # Depends on UserSerializer and QuestionReadOnlySerializer
 class QuizReadOnlySerializer(serializers.ModelSerializer):
     teacher = UserSerializer(read_only=True)  # Use read-only user serializer
-    questions = QuestionReadOnlySerializer(many=True)
+    # Rendered like QuestionReadOnlySerializer(many=True), see get_questions()
+    questions = serializers.SerializerMethodField()
     is_available_for_submission = serializers.BooleanField(
         read_only=True
     )  # Expose model property
@@ -407,10 +477,58 @@ class QuizReadOnlySerializer(serializers.ModelSerializer):
         # To make all listed fields read-only, assign the fields tuple itself.
         read_only_fields = fields
 
+    def get_questions(self, obj):
+        # Large quizzes have many questions; build them as plain dicts from the
+        # prefetched rows instead of a nested ListSerializer pass
+        return [
+            QuestionReadOnlySerializer.represent(question)
+            for question in obj.questions.all()
+        ]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Joins/prefetches everything this serializer renders, avoiding N+1 queries."""
+        return queryset.select_related("teacher").prefetch_related(
+            "questions__answer_options"
+        )
+
+
+# Slim quiz representation for places that only need to identify the quiz
+class MinimalQuizSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Quiz
+        fields = ("id", "title")
+        read_only_fields = fields
+
 
 # --- Submission Serializers ---
 
 
+# Question types answered by selecting options
+_MCQ_TYPES = frozenset((QuestionTypes.SINGLE_MCQ, QuestionTypes.MULTI_MCQ))
+
+
+class _SubmissionCtx:
+    """
+    Per-request lookups for validating one quiz submission, built once from the
+    prefetched quiz and shared with the nested answer serializers through the
+    context as `_ctx`. Slots keep the per-answer attribute reads cheap.
+    """
+
+    __slots__ = ("quiz", "questions_by_id", "option_ids_by_question", "is_available")
+
+    def __init__(self, quiz):
+        questions = quiz.questions.all()  # Prefetched, no extra query
+        self.quiz = quiz
+        self.questions_by_id = {question.id: question for question in questions}
+        self.option_ids_by_question = {
+            question.id: {option.id for option in question.answer_options.all()}
+            for question in questions
+        }
+        # Set by QuizSubmissionSerializer.validate()
+        self.is_available = None
+
+
 # No dependencies on other serializers defined in this file
 class ParticipantAnswerSubmitSerializer(serializers.Serializer):
     """Serializer for submitting individual answers within a quiz attempt."""
@@ -428,6 +546,18 @@ class ParticipantAnswerSubmitSerializer(serializers.Serializer):
         help_text="Boolean answer for True/False questions (True or False).",
     )
 
+    def _get_valid_option_ids(self, question):
+        # IDs of the question's options, prebuilt by QuizSubmissionSerializer when
+        # available, otherwise taken from the prefetched answer_options.
+        # Only MCQ answers with a selection need them, so they're looked up lazily.
+        ctx = self.context.get("_ctx")
+        valid_option_ids = (
+            ctx.option_ids_by_question.get(question.id) if ctx is not None else None
+        )
+        if valid_option_ids is None:
+            valid_option_ids = {option.id for option in question.answer_options.all()}
+        return valid_option_ids
+
     def validate(self, data):
         question_id = data.get("question_id")
         selected_option_ids = data.get("selected_option_ids", [])
@@ -438,71 +568,78 @@ class ParticipantAnswerSubmitSerializer(serializers.Serializer):
                 "question_id is required for each answer."
             )
 
-        try:
-            # Use select_related for quiz to avoid N+1 queries later if accessing quiz properties
-            question = (
-                Question.objects.select_related("quiz")
-                .prefetch_related("answer_options")
-                .get(id=question_id)
-            )
-        except Question.DoesNotExist:
+        # Reject structurally incoherent answers before looking up the question
+        has_options = bool(selected_option_ids)
+        has_bool = selected_answer_bool is not None
+        if has_options and has_bool:
             raise serializers.ValidationError(
-                f"Question with ID {question_id} does not exist."
+                "Provide only one of selected_option_ids/selected_answer_bool."
             )
 
+        # QuizSubmissionSerializer preloads the quiz's questions into the context,
+        # so each answer is a dict lookup instead of its own query
+        ctx = self.context.get("_ctx")
+        if ctx is not None:
+            question = ctx.questions_by_id.get(question_id)
+            if question is None:
+                raise serializers.ValidationError(
+                    f"Question ID {question_id} does not belong to this quiz."
+                )
+        else:
+            try:
+                # Use select_related for quiz to avoid N+1 queries later if accessing quiz properties
+                question = (
+                    Question.objects.select_related("quiz")
+                    .prefetch_related("answer_options")
+                    .get(id=question_id)
+                )
+            except Question.DoesNotExist:
+                raise serializers.ValidationError(
+                    f"Question with ID {question_id} does not exist."
+                )
+
         # Store question object for later use in QuizSubmissionSerializer validation or view
         data["question"] = question
 
         # Validate based on question type
-        if question.question_type == QuestionTypes.SINGLE_MCQ:
-            if selected_answer_bool is not None:
+        question_type = question.question_type
+        if question_type in _MCQ_TYPES:
+            if has_bool:
                 raise serializers.ValidationError(
-                    "selected_answer_bool is not allowed for SINGLE_MCQ."
+                    f"selected_answer_bool is not allowed for {question_type}."
                 )
-            if len(selected_option_ids) > 1:
+            if (
+                question_type == QuestionTypes.SINGLE_MCQ
+                and len(selected_option_ids) > 1
+            ):
                 raise serializers.ValidationError(
                     "Only one selected_option_id is allowed for SINGLE_MCQ."
                 )
             # Validate selected option IDs belong to the question
-            if selected_option_ids:
-                valid_option_ids = set(
-                    question.answer_options.values_list("id", flat=True)
-                )
-                if not set(selected_option_ids).issubset(valid_option_ids):
-                    raise serializers.ValidationError(
-                        "One or more selected_option_ids do not belong to this question."
-                    )
-
-        elif question.question_type == QuestionTypes.MULTI_MCQ:
-            if selected_answer_bool is not None:
-                raise serializers.ValidationError(
-                    "selected_answer_bool is not allowed for MULTI_MCQ."
-                )
-            # Validate selected option IDs belong to the question
-            if selected_option_ids:
-                valid_option_ids = set(
-                    question.answer_options.values_list("id", flat=True)
-                )
-                if not set(selected_option_ids).issubset(valid_option_ids):
+            if has_options:
+                valid_option_ids = self._get_valid_option_ids(question)
+                if any(
+                    option_id not in valid_option_ids
+                    for option_id in selected_option_ids
+                ):
                     raise serializers.ValidationError(
                         "One or more selected_option_ids do not belong to this question."
                     )
 
-        elif question.question_type == QuestionTypes.TRUE_FALSE:
-            if selected_option_ids:
+        elif question_type == QuestionTypes.TRUE_FALSE:
+            if has_options:
                 raise serializers.ValidationError(
                     "selected_option_ids are not allowed for TRUE_FALSE."
                 )
-            if selected_answer_bool is None:
+            if not has_bool:
                 raise serializers.ValidationError(
                     "selected_answer_bool is required for TRUE_FALSE."
                 )
-        else:
+        elif has_options or has_bool:
             # Handle cases for potential other question types if needed
-            if selected_option_ids or selected_answer_bool is not None:
-                raise serializers.ValidationError(
-                    f"Answer format invalid for question type {question.question_type}."
-                )
+            raise serializers.ValidationError(
+                f"Answer format invalid for question type {question_type}."
+            )
 
         return data
 
@@ -515,6 +652,30 @@ class QuizSubmissionSerializer(serializers.Serializer):
     # Use the submit serializer for nested answers
     answers = ParticipantAnswerSubmitSerializer(many=True)
 
+    def _load_quiz(self, quiz_id):
+        # Prefer the quiz the view already loaded (with prefetched questions and
+        # options, see QuizViewSet.submit) when it is the submitted one
+        quiz = self.context.get("quiz")
+        if quiz is not None and quiz.id == quiz_id:
+            return quiz
+        # Use prefetch_related for questions and answer_options for efficient access
+        return Quiz.objects.prefetch_related("questions__answer_options").get(
+            id=quiz_id
+        )
+
+    def to_internal_value(self, data):
+        # Load the quiz once, before the nested answers are validated, and share
+        # its questions and option IDs with ParticipantAnswerSubmitSerializer
+        # through the context (nested fields read the root serializer's context)
+        try:
+            quiz = self._load_quiz(int(data.get("quiz_id")))
+        except (AttributeError, TypeError, ValueError, Quiz.DoesNotExist):
+            # Reported by the regular field and validate() checks
+            quiz = None
+        if quiz is not None:
+            self.context["_ctx"] = _SubmissionCtx(quiz)
+        return super().to_internal_value(data)
+
     def validate(self, data):
         quiz_id = data.get("quiz_id")
         answers_data = data.get("answers", [])
@@ -522,64 +683,92 @@ class QuizSubmissionSerializer(serializers.Serializer):
         if quiz_id is None:
             raise serializers.ValidationError("quiz_id is required.")
 
-        try:
-            # Use prefetch_related for questions and answer_options for efficient access
-            quiz = Quiz.objects.prefetch_related("questions__answer_options").get(
-                id=quiz_id
-            )
-        except Quiz.DoesNotExist:
-            raise serializers.ValidationError(f"Quiz with ID {quiz_id} does not exist.")
+        # Reuse the quiz loaded by to_internal_value() when it is the same one
+        ctx = self.context.get("_ctx")
+        if ctx is None or ctx.quiz.id != quiz_id:
+            try:
+                ctx = _SubmissionCtx(self._load_quiz(quiz_id))
+            except Quiz.DoesNotExist:
+                raise serializers.ValidationError(
+                    f"Quiz with ID {quiz_id} does not exist."
+                )
+            self.context["_ctx"] = ctx
+        quiz = ctx.quiz
 
         # Store quiz object in validated_data for later use in view
         data["quiz"] = quiz
 
-        # Check if the quiz is available for submission
-        if not quiz.is_available_for_submission:
+        # Check if the quiz is available for submission. The result is kept in
+        # the context so the view doesn't have to evaluate it again.
+        ctx.is_available = quiz.is_available_for_submission
+        if not ctx.is_available:
             raise serializers.ValidationError(
                 "This quiz is not currently available for submission."
             )
 
-        # Check for duplicate question IDs in the submission
-        question_ids = [
-            answer.get("question_id")
-            for answer in answers_data
-            if answer.get("question_id") is not None
-        ]
-        if len(question_ids) != len(set(question_ids)):
-            raise serializers.ValidationError(
-                "Duplicate question IDs found in the submission."
-            )
-
-        # Ensure all submitted question IDs belong to the quiz
-        valid_quiz_question_ids = set(quiz.questions.values_list("id", flat=True))
+        # In a single pass, check for duplicate question IDs in the submission
+        # and ensure all submitted question IDs belong to the quiz.
+        # The validate method of ParticipantAnswerSubmitSerializer already
+        # validated that the question exists and belongs to the quiz implicitly
+        # if the question object was attached. Let's re-check explicitly here for safety.
+        # Membership is checked against the questions_by_id map of this quiz
+        valid_quiz_question_ids = ctx.questions_by_id
+        submitted_question_ids = set()
         for answer_data in answers_data:
-            # The validate method of ParticipantAnswerSubmitSerializer already
-            # validated that the question exists and belongs to the quiz implicitly
-            # if the question object was attached. Let's re-check explicitly here for safety.
             submitted_question_id = answer_data.get("question_id")
-            if (
-                submitted_question_id is not None
-                and submitted_question_id not in valid_quiz_question_ids
-            ):
+            if submitted_question_id is None:
+                continue
+            if submitted_question_id in submitted_question_ids:
+                raise serializers.ValidationError(
+                    "Duplicate question IDs found in the submission."
+                )
+            if submitted_question_id not in valid_quiz_question_ids:
                 raise serializers.ValidationError(
                     f"Question ID {submitted_question_id} does not belong to this quiz."
                 )
+            submitted_question_ids.add(submitted_question_id)
 
         # Optional: Check if *all* questions from the quiz are answered
         # This depends on whether incomplete submissions are allowed.
         # If all questions must be answered:
-        # quiz_question_ids = set(quiz.questions.values_list('id', flat=True))
-        # submitted_question_ids = set(question_ids)
-        # if quiz_question_ids != submitted_question_ids:
-        #      missing_ids = list(quiz_question_ids - submitted_question_ids)
+        # (reuse valid_quiz_question_ids, built from the prefetched questions above)
+        # missing_ids = [qid for qid in valid_quiz_question_ids if qid not in submitted_question_ids]
+        # if missing_ids:
         #      raise serializers.ValidationError(f"Submission must include answers for all questions. Missing IDs: {missing_ids}")
 
         return data
 
 
+class _ResultCtx:
+    """Per-request memo for the attempt result serializers, stored as `_result_ctx`."""
+
+    __slots__ = ("now", "show_results_by_quiz", "timing_by_quiz")
+
+    def __init__(self):
+        self.now = timezone.now()
+        self.show_results_by_quiz = {}
+        self.timing_by_quiz = {}
+
+    @classmethod
+    def of(cls, context):
+        """The memo of a serializer context, created on first use."""
+        ctx = context.get("_result_ctx")
+        if ctx is None:
+            ctx = context["_result_ctx"] = cls()
+        return ctx
+
+
 # Depends on QuestionReadOnlySerializer
 class ParticipantAnswerResultSerializer(serializers.ModelSerializer):
-    """Serializer for viewing results of individual participant answers."""
+    """
+    Serializer for viewing results of individual participant answers.
+
+    Expects answers loaded with their question's answer_options and their
+    selected_options prefetched, and with attempt.quiz available without a
+    query. Rendered through QuizAttemptResultSerializer.setup_eager_loading(),
+    the prefetched answers point back at their already joined attempt.
+    Answers loaded on their own need select_related("attempt__quiz").
+    """
 
     # Use QuestionReadOnlySerializer which hides default `is_correct` on AnswerOption
     question = QuestionReadOnlySerializer(read_only=True)
@@ -606,49 +795,46 @@ class ParticipantAnswerResultSerializer(serializers.ModelSerializer):
         # FIX: read_only_fields must be a list or tuple
         read_only_fields = fields
 
+    def _show_results(self, quiz):
+        """
+        Only show correct answers if the quiz availability window has passed OR
+        there was no end window (results are immediate).
+        Memoized per quiz in the serializer context, with a single `now`, so a
+        payload of many answers doesn't recompute it per answer and per field.
+        """
+        ctx = _ResultCtx.of(self.context)
+        show_results = ctx.show_results_by_quiz.get(quiz.id)
+        if show_results is None:
+            show_results = ctx.show_results_by_quiz[quiz.id] = (
+                quiz.available_to is None or ctx.now > quiz.available_to
+            )
+        return show_results
+
     # --- The expected method fields are defined here ---
     def get_correct_answer_bool(self, obj):  # <-- This method should exist
-        # Only show correct answer if the quiz availability window has passed OR there was no end window.
-        attempt = obj.attempt
-        quiz = attempt.quiz
-        now = timezone.now()
-
-        # Show results if the quiz is NOT currently available for submission because the end time has passed
-        show_results = False
-        if quiz.available_to is not None and now > quiz.available_to:
-            show_results = True
-
-        # Also show results if there was no end time specified (results are immediate)
-        if quiz.available_to is None:
-            show_results = True
-
-        if show_results and obj.question.question_type == QuestionTypes.TRUE_FALSE:
+        if (
+            self._show_results(obj.attempt.quiz)
+            and obj.question.question_type == QuestionTypes.TRUE_FALSE
+        ):
             # obj.question should be prefetched by QuizAttemptResultSerializer
             return obj.question.correct_answer_bool
         return None  # Do not show correct boolean otherwise
 
     def get_correct_options(self, obj):  # <-- This method should exist
-        # Only show correct options if the quiz availability window has passed OR there was no end window.
-        # Same logic as get_correct_answer_bool
-        attempt = obj.attempt
-        quiz = attempt.quiz
-        now = timezone.now()
-
-        show_results = False
-        if quiz.available_to is not None and now > quiz.available_to:
-            show_results = True
-        if quiz.available_to is None:
-            show_results = True
-
-        if show_results and obj.question.question_type in [
+        # Same visibility rule as get_correct_answer_bool
+        if self._show_results(obj.attempt.quiz) and obj.question.question_type in [
             QuestionTypes.SINGLE_MCQ,
             QuestionTypes.MULTI_MCQ,
         ]:
-            # obj.question should be prefetched by QuizAttemptResultSerializer
-            # Return serialized correct options, including is_correct=True
-            # Use AnswerOptionSerializer which excludes is_correct
-            correct_options = obj.question.answer_options.filter(is_correct=True)
-            return AnswerOptionSerializer(correct_options, many=True).data
+            # obj.question and its answer_options should be prefetched by the view,
+            # so filter them in Python instead of issuing a query per answer.
+            # Rendered like AnswerOptionSerializer(many=True), which excludes
+            # is_correct, without building a new serializer for every answer
+            return [
+                {"id": option.id, "text": option.text}
+                for option in obj.question.answer_options.all()
+                if option.is_correct
+            ]
         return []  # Do not show correct options otherwise
 
 
@@ -657,14 +843,15 @@ class QuizAttemptResultSerializer(serializers.ModelSerializer):
     """Serializer for viewing overall quiz attempt results."""
 
     user = UserSerializer(read_only=True)
-    # Use QuizReadOnlySerializer which includes QuestionReadOnlySerializer
-    quiz = QuizReadOnlySerializer(read_only=True)
+    # Only id and title by default; the full QuizReadOnlySerializer tree (teacher,
+    # questions, options) is rendered when the context has expand_quiz=True
+    quiz = MinimalQuizSerializer(read_only=True)
     # Use ParticipantAnswerResultSerializer for nested answer results
     participant_answers = ParticipantAnswerResultSerializer(many=True, read_only=True)
 
     # Add fields for rank and best score
-    # Note: Rank calculation here within the serializer method can be inefficient for large datasets.
-    # It's often better to annotate the rank in the view's queryset if possible.
+    # Rank is read from the `rank_value` annotation (see QuizAttempt.annotate_rank),
+    # and only rendered when the context sets `include_rank`
     rank = serializers.SerializerMethodField()
     best_score_for_user_on_quiz = (
         serializers.SerializerMethodField()
@@ -685,66 +872,124 @@ class QuizAttemptResultSerializer(serializers.ModelSerializer):
         # FIX: read_only_fields must be a list or tuple
         read_only_fields = fields
 
-    def get_rank(self, obj):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.context.get("expand_quiz"):
+            self.fields["quiz"] = QuizReadOnlySerializer(read_only=True)
+
+    @cached_property
+    def _readable_field_items(self):
+        # Fields are final once __init__ has run (see the expand_quiz swap above)
+        return tuple(
+            (field.field_name, field)
+            for field in self.fields.values()
+            if not field.write_only
+        )
+
+    def to_representation(self, instance):
         """
-        Calculates the rank of this attempt based on score and submission time
-        compared to other attempts for the same quiz.
-        Orders by score (desc) then submission_time (asc).
-        Note: This calculates the rank of the *attempt*, not the user's best rank.
-        Consider performance for many attempts. This implementation calculates rank on the fly.
+        Same output as Serializer.to_representation(). A list response renders
+        every attempt through one child serializer, so its readable fields are
+        collected once instead of re-walking the field dict for every attempt.
         """
-        # Requires Django 3.2+ for Window functions
-        # from django.db.models import Window
-        # from django.db.models.functions import Rank
-
-        # Find attempts with higher score OR same score and earlier time for the same quiz
-        rank_query = (
-            QuizAttempt.objects.filter(
-                quiz=obj.quiz  # Filter for the same quiz as the current object
-            )
-            .filter(
-                # Score is higher OR (Score is same AND submission is earlier)
-                Q(score__gt=obj.score)
-                | Q(score=obj.score, submission_time__lt=obj.submission_time)
+        ret = {}
+        for field_name, field in self._readable_field_items:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            # None is rendered as-is, without the field's to_representation()
+            ret[field_name] = (
+                None if attribute is None else field.to_representation(attribute)
             )
-            .count()
+        return ret
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, expand_quiz=False):
+        """Joins/prefetches everything this serializer renders, avoiding N+1 queries."""
+        queryset = queryset.select_related("user", "quiz").prefetch_related(
+            # Only the columns the answer results render; e.g. the questions'
+            # correct_option_ids list is never shown
+            Prefetch(
+                "participant_answers__question",
+                queryset=Question.objects.only(
+                    "id", "question_type", "text", "points", "correct_answer_bool"
+                ),
+            ),
+            "participant_answers__question__answer_options",
+            Prefetch(
+                "participant_answers__selected_options",
+                queryset=AnswerOption.objects.only("id", "text"),
+            ),
         )
+        if expand_quiz:
+            # What QuizReadOnlySerializer renders, one relation further away
+            queryset = queryset.select_related("quiz__teacher").prefetch_related(
+                "quiz__questions__answer_options"
+            )
+        return queryset
 
-        # Rank is 1 + count of attempts that are definitively ranked above this one
-        rank = rank_query + 1
+    def get_rank(self, obj):
+        """
+        Rank of this attempt among the attempts for the same quiz, ordered by
+        score (desc) then submission_time (asc). Tied attempts share a rank.
+        Note: This is the rank of the *attempt*, not the user's best rank.
+        Only computed when the context sets `include_rank` (detail responses),
+        list responses render None. The detail view annotates it via
+        QuizAttempt.annotate_rank(); the query below is only a fallback for a
+        lone, unannotated attempt.
+        """
+        if not self.context.get("include_rank", False):
+            return None
+        rank_value = getattr(obj, "rank_value", None)
+        if rank_value is not None:
+            return rank_value
 
-        # Note: This basic count rank handles ties by giving the same rank number.
-        # If multiple attempts have the exact same score and same submission time, they will have the same rank number.
-        # The view's queryset annotation is the preferred way for performance.
-        # If calculating here for simplicity but potential inefficiency:
-        # For production or large datasets, calculate this in the view's queryset using Window functions
-        # and access the annotated field in the serializer.
+        # Find attempts with higher score OR same score and earlier time for the same quiz
+        ranked_above = QuizAttempt.objects.filter(
+            Q(score__gt=obj.score)
+            | Q(score=obj.score, submission_time__lt=obj.submission_time),
+            quiz_id=obj.quiz_id,  # Filter for the same quiz as the current object
+        ).count()
 
-        return rank
+        # Rank is 1 + count of attempts that are definitively ranked above this one
+        return ranked_above + 1
 
     def get_best_score_for_user_on_quiz(self, obj):
         """
         Finds the best score for the *current user* on this quiz.
         Timed quizzes: Max score across all attempts by the user.
         Untimed quizzes: Score of the first attempt by the user.
+        List/detail views annotate it via QuizAttempt.annotate_best_score();
+        the queries below are only a fallback for a lone, unannotated attempt.
         """
-        attempts_by_user = QuizAttempt.objects.filter(user=obj.user, quiz=obj.quiz)
-
-        if not attempts_by_user.exists():
-            return 0.0  # Should not happen if we're serializing an attempt
-
-        # Sort attempts by submission time to find the first one if needed
-        attempts_by_user = attempts_by_user.order_by("submission_time")
+        best_score = getattr(obj, "best_score", None)
+        if best_score is not None:
+            return best_score
 
-        if obj.quiz.timing_minutes is not None and obj.quiz.timing_minutes > 0:
+        attempts_by_user = QuizAttempt.objects.filter(
+            user_id=obj.user_id, quiz_id=obj.quiz_id
+        )
+        # Memoized by quiz_id, so attempts whose quiz wasn't joined load it once
+        timing_by_quiz = _ResultCtx.of(self.context).timing_by_quiz
+        if obj.quiz_id not in timing_by_quiz:
+            timing_by_quiz[obj.quiz_id] = obj.quiz.timing_minutes
+        timing_minutes = timing_by_quiz[obj.quiz_id]
+        if timing_minutes is not None and timing_minutes > 0:
             # Timed quiz: best score is the max score
             return (
                 attempts_by_user.aggregate(max_score=Max("score"))["max_score"] or 0.0
             )
         else:
-            # Untimed quiz: best score is the score of the first attempt
-            first_attempt = attempts_by_user.first()
-            return first_attempt.score if first_attempt else 0.0
+            # Untimed quiz: best score is the score of the first attempt. Only
+            # the score column is read, no QuizAttempt instance is built, and
+            # no attempts (None) falls back to 0.0 like the timed branch.
+            return (
+                attempts_by_user.order_by("submission_time")
+                .values_list("score", flat=True)
+                .first()
+                or 0.0
+            )
 
 
 # --- Top-Level Writable Serializers ---
@@ -755,12 +1000,12 @@ class QuizAttemptResultSerializer(serializers.ModelSerializer):
 class QuizWritableSerializer(serializers.ModelSerializer):
     """
     Writable serializer for Quiz, with manual nested create/update orchestrated
-    by overriding create/update methods and calling nested serializers' saves.
+    by overriding create/update methods and writing the nested rows in bulk.
     """
 
     # Use the writable nested serializer for questions
-    # This serializer's create/update will iterate through questions data and call
-    # QuizQuestionWritableSerializer's create/update methods.
+    # This serializer's create/update write the validated questions data in bulk,
+    # reusing QuizQuestionWritableSerializer's option helpers.
     questions = QuizQuestionWritableSerializer(many=True)
 
     # Read-only fields that will be returned in the response but not taken from input
@@ -795,19 +1040,57 @@ class QuizWritableSerializer(serializers.ModelSerializer):
         # The current user (teacher/admin) is automatically set as the creator by the view.
         quiz_instance = Quiz.objects.create(**validated_data)
 
-        # Manually handle nested question creation using the nested serializer's create method
-        # The nested serializer's create method handles its own children (options).
-        for question_data in questions_data:
-            # Create a new instance of the nested serializer for each question data dictionary
-            question_serializer = QuizQuestionWritableSerializer(data=question_data)
-            question_serializer.is_valid(raise_exception=True)
-            # Call the nested serializer's save method, passing the parent quiz instance.
-            # The nested serializer's create method handles saving itself,
-            # setting the quiz FK, and handling its nested options.
-            question_serializer.save(quiz=quiz_instance)  # Pass quiz instance to set FK
+        self._bulk_create_questions(quiz_instance, questions_data)
 
         return quiz_instance
 
+    @staticmethod
+    def _bulk_create_questions(quiz_instance, questions_data):
+        """
+        Creates new questions of quiz_instance, with their options, from validated
+        question data using one INSERT for all questions and one for all options.
+        """
+        if not questions_data:
+            return
+        # questions_data was already validated (options included) by this serializer's
+        # nested field, so the rows are built directly instead of through one
+        # nested serializer save per question
+        questions = []
+        options_data_per_question = []
+        for question_data in questions_data:
+            question_fields = dict(question_data)
+            # New rows always get a fresh primary key
+            question_fields.pop("id", None)
+            options_data_per_question.append(question_fields.pop("answer_options", []))
+            # Set the quiz FK
+            questions.append(Question(quiz=quiz_instance, **question_fields))
+        # bulk_create() sets the primary keys on the objects (SQLite/PostgreSQL)
+        Question.objects.bulk_create(questions, batch_size=500)
+
+        options_per_question = [
+            QuizQuestionWritableSerializer.build_answer_options(question, options_data)
+            for question, options_data in zip(questions, options_data_per_question)
+        ]
+        AnswerOption.objects.bulk_create(
+            [option for options in options_per_question for option in options],
+            batch_size=1000,
+        )
+
+        # bulk_create() doesn't send post_save, so fill the denormalized
+        # correct option IDs here, again with a single statement (an upsert of
+        # the just inserted rows, see QuizWritableSerializer.update)
+        for question, options in zip(questions, options_per_question):
+            question.correct_option_ids = sorted(
+                option.pk for option in options if option.is_correct
+            )
+        Question.objects.bulk_create(
+            questions,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["correct_option_ids"],
+            batch_size=500,
+        )
+
     @transaction.atomic  # Ensure atomicity
     def update(self, instance, validated_data):
         # Extract nested questions data (might be absent in PATCH)
@@ -820,68 +1103,97 @@ class QuizWritableSerializer(serializers.ModelSerializer):
             attr: value for attr, value in validated_data.items() if attr != "questions"
         }
 
-        for attr, value in fields_to_update_on_quiz.items():
-            setattr(instance, attr, value)
-        instance.save()  # Save the main instance fields
+        # Only write the columns whose value actually changes, and skip the quiz
+        # row entirely when e.g. only nested questions were sent
+        changed_fields = [
+            attr
+            for attr, value in fields_to_update_on_quiz.items()
+            if getattr(instance, attr) != value
+        ]
+        for attr in changed_fields:
+            setattr(instance, attr, fields_to_update_on_quiz[attr])
+        if changed_fields:
+            # update_fields must name auto_now columns for them to be written
+            instance.save(update_fields=[*changed_fields, "updated_at"])
+        elif questions_data is not None:
+            # The nested questions are part of the quiz's representation, so
+            # move its updated_at (and with it the ETag, see quiz_etag()) too.
+            # save() also sends post_save, dropping the cached available list.
+            instance.save(update_fields=["updated_at"])
 
         # Manually handle question updates/creations/deletions
         if (
             questions_data is not None
         ):  # Process options only if data is provided in request
-            existing_questions = {str(o.pk): o for o in instance.questions.all()}
+            # Key by the raw integer PKs; DRF has already coerced incoming IDs to int.
+            # Prefetch the options of all existing questions in one query, so
+            # syncing their options reads question.answer_options.all() from memory
+            # instead of issuing one SELECT per question.
+            existing_questions = {
+                o.pk: o for o in instance.questions.prefetch_related("answer_options")
+            }
             incoming_questions_map = {
-                str(o.get("id")): o for o in questions_data if q.get("id")
+                o.get("id"): o for o in questions_data if o.get("id")
             }
 
-            # Determine which existing options are NOT in the incoming data (to delete)
-            options_to_delete = [
-                option
-                for pk, option in existing_options.items()
-                if pk not in incoming_options_map
-            ]
-
-            # Delete options not in incoming data for THIS question
-            if options_to_delete:
-                # Use a list() to evaluate the queryset before deleting to avoid issues
-                instance.questions.filter(
-                    id__in=[q.id for q in options_to_delete]
-                ).delete()
-
-            processed_question_instances = []  # Collect updated/created question instances
-
-            # Process incoming questions (update or create)
+            # Delete the existing questions missing from the incoming data with a
+            # single DELETE (their options cascade)
+            stale_question_ids = (
+                existing_questions.keys() - incoming_questions_map.keys()
+            )
+            if stale_question_ids:
+                # updated_at was moved above, so the per-question touch is skipped
+                with skip_quiz_touch():
+                    instance.questions.filter(id__in=stale_question_ids).delete()
+
+            # Apply the incoming fields to the kept questions in memory; they are
+            # written back with one upsert instead of one save() each.
+            # Questions with an unknown or no ID are created.
+            # Keyed by PK, so a question written for several reasons is sent once
+            questions_to_update = {}
+            fields_to_update = set()
+            options_data_per_question = []
+            new_questions_data = []
             for question_data in questions_data:
-                question_id = question_data.get("id")
-                existing_question = (
-                    existing_questions.get(str(question_id)) if question_id else None
+                existing_question = existing_questions.get(question_data.get("id"))
+                if existing_question is None:
+                    new_questions_data.append(question_data)
+                    continue
+                for attr, value in question_data.items():
+                    if attr == "answer_options":
+                        options_data_per_question.append((existing_question, value))
+                    elif attr != "id" and getattr(existing_question, attr) != value:
+                        # Unchanged questions aren't rewritten at all
+                        setattr(existing_question, attr, value)
+                        fields_to_update.add(attr)
+                        questions_to_update[existing_question.pk] = existing_question
+
+            # Options of all kept questions are synced together, and the
+            # denormalized correct option IDs ride along in the upsert
+            if options_data_per_question:
+                sync_answer_options = QuizQuestionWritableSerializer.sync_answer_options
+                options_per_question = sync_answer_options(options_data_per_question)
+                for (question, _), options in zip(
+                    options_data_per_question, options_per_question
+                ):
+                    correct_option_ids = sorted(
+                        option.pk for option in options if option.is_correct
+                    )
+                    if correct_option_ids != question.correct_option_ids:
+                        question.correct_option_ids = correct_option_ids
+                        fields_to_update.add("correct_option_ids")
+                        questions_to_update[question.pk] = question
+            if questions_to_update:
+                # INSERT ... ON CONFLICT (id) DO UPDATE of the complete, already
+                # loaded rows (see QuizQuestionWritableSerializer.sync_answer_options)
+                Question.objects.bulk_create(
+                    list(questions_to_update.values()),
+                    update_conflicts=True,
+                    unique_fields=["id"],
+                    update_fields=sorted(fields_to_update),
+                    batch_size=500,
                 )
 
-                # Use the nested Question serializer's update/create method
-                # Its update method handles nested options and the answer_options.set() call
-                question_serializer = QuizQuestionWritableSerializer(
-                    instance=existing_question,  # Pass existing instance for update or None for create
-                    data=question_data,  # Data for the question and its options
-                    partial=True,  # Allow partial updates
-                    # context={'request': self.context.get('request')}
-                )
-                question_serializer.is_valid(raise_exception=True)
-                # Call the nested serializer's save method, passing the parent quiz instance.
-                # The nested serializer's save() method handles saving itself,
-                # setting the quiz FK, and handling its nested options (including the .set()).
-                processed_question_instance = question_serializer.save(
-                    quiz=instance
-                )  # Pass quiz instance
-
-                processed_question_instances.append(processed_question_instance)
-
-            # For ManyToOne/OneToMany relationship (Quiz <- Question),
-            # saving the child with the parent FK is sufficient to link it.
-            # Deletion of questions not in incoming data handles removal.
-            # A final .set() on quiz.questions is typically not strictly necessary here
-            # unless you have complex ManyToMany relationships managed on the parent side.
-            # We rely on question_serializer.save(quiz=instance) to establish the link.
-
-        # Re-save the main instance after nested updates if any fields were updated before
-        # instance.save() # Usually not needed if fields were set directly and saved earlier
+            self._bulk_create_questions(instance, new_questions_data)
 
         return instance
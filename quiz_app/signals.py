@@ -0,0 +1,110 @@
+# quiz_app/signals.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AnswerOption, Question, Quiz
+
+
+# Set while a caller that stores correct_option_ids itself changes options
+_skipping_correct_option_ids_refresh = ContextVar(
+    "skipping_correct_option_ids_refresh", default=False
+)
+
+
+# Set while a caller that moves the quiz's updated_at itself changes its
+# questions or options
+_skipping_quiz_touch = ContextVar("skipping_quiz_touch", default=False)
+
+
+def _origin_model(origin):
+    # The model of the instance or queryset whose delete() started the deletion
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+@contextmanager
+def skip_correct_option_ids_refresh():
+    """
+    Turns off sync_correct_option_ids for the options saved or deleted inside
+    the block, for callers that store the questions' correct_option_ids
+    themselves (e.g. after deleting many options with one queryset delete()).
+    """
+    token = _skipping_correct_option_ids_refresh.set(True)
+    try:
+        yield
+    finally:
+        _skipping_correct_option_ids_refresh.reset(token)
+
+
+@contextmanager
+def skip_quiz_touch():
+    """
+    Turns off touch_quiz for the questions and options saved or deleted inside
+    the block, for callers that move the quiz's updated_at once themselves
+    (e.g. QuizWritableSerializer.update() deleting many questions at once).
+    """
+    token = _skipping_quiz_touch.set(True)
+    try:
+        yield
+    finally:
+        _skipping_quiz_touch.reset(token)
+
+
+@receiver(post_save, sender=AnswerOption, dispatch_uid="answer_option_saved")
+@receiver(post_delete, sender=AnswerOption, dispatch_uid="answer_option_deleted")
+def sync_correct_option_ids(sender, instance, **kwargs):
+    """
+    Keeps Question.correct_option_ids in step with the question's answer options.
+    """
+    if _skipping_correct_option_ids_refresh.get():
+        # The caller stores correct_option_ids, see skip_correct_option_ids_refresh()
+        return
+    # Options deleted in a cascade from their question (or its quiz) leave no
+    # question to refresh; post_save has no origin and always refreshes
+    origin = kwargs.get("origin")
+    if origin is not None and _origin_model(origin) is not AnswerOption:
+        return
+    Question.refresh_correct_option_ids(instance.question_id)
+
+
+@receiver(post_save, sender=Question, dispatch_uid="question_saved_touch_quiz")
+@receiver(post_delete, sender=Question, dispatch_uid="question_deleted_touch_quiz")
+@receiver(post_save, sender=AnswerOption, dispatch_uid="answer_option_saved_touch_quiz")
+@receiver(
+    post_delete, sender=AnswerOption, dispatch_uid="answer_option_deleted_touch_quiz"
+)
+def touch_quiz(sender, instance, **kwargs):
+    """
+    Moves the quiz's updated_at when one of its questions or options changes.
+    The questions are part of the quiz's detail response, so this changes its
+    ETag (see quiz_app.views.quiz_etag) for writes from any path: the shell,
+    the admin or a nested serializer used on its own. Saving the quiz also
+    sends its post_save, which drops the cached list of available quizzes.
+    """
+    if _skipping_quiz_touch.get():
+        # The caller moves updated_at, see skip_quiz_touch()
+        return
+    # Rows deleted in a cascade from their question or quiz leave that deletion
+    # to touch the quiz, or leave no quiz to touch
+    origin = kwargs.get("origin")
+    if origin is not None and _origin_model(origin) is not sender:
+        return
+    question = instance if sender is Question else instance.question
+    # update_fields must name auto_now columns for them to be written
+    Quiz.objects.only("id").get(pk=question.quiz_id).save(update_fields=["updated_at"])
+
+
+@receiver(post_save, sender=Quiz, dispatch_uid="quiz_saved")
+@receiver(post_delete, sender=Quiz, dispatch_uid="quiz_deleted")
+def invalidate_available_quiz_list(sender, instance, **kwargs):
+    """
+    Drops the cached list of available quizzes the saved or deleted quiz may
+    appear in. Only the current time bucket can still be read, so that is the
+    only key. With a per-process cache (the default LocMemCache) this only
+    reaches the current worker; see quiz_frontend.views.quiz_list_view.
+    """
+    cache.delete(Quiz.available_list_cache_key())
@@ -16,6 +16,7 @@ from quiz_app.models import (
     ParticipantAnswer,
     QuestionTypes,
 )
+from django.core.cache import cache
 from django.utils import timezone
 
 # Import itertools for counter to generate unique usernames/emails
@@ -25,6 +26,18 @@ import itertools
 user_counter = itertools.count()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache, so no cached page or list leaks in."""
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hasher(settings):
+    """Hash test passwords with MD5; the default PBKDF2 dominates user creation."""
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
 @pytest.fixture
 def api_client():
     """A Django REST framework APIClient instance."""
@@ -97,6 +110,8 @@ def authenticated_client(api_client, create_user, request):
     A fixture that provides an authenticated APIClient.
     Uses markers like @pytest.mark.student, @pytest.mark.teacher, etc.
     The user created is determined by the marker on the test function.
+    The client is force-authenticated; mark the test with @pytest.mark.real_login
+    to log in through the API and send the JWT instead.
     """
     user = None
     if "admin" in request.keywords:
@@ -116,6 +131,14 @@ def authenticated_client(api_client, create_user, request):
             "Authenticated client fixture failed to create a user based on markers."
         )
 
+    api_client.user = user  # Store the user object
+
+    if "real_login" not in request.keywords:
+        # Skip the login round trip (password check, JWT minting) for tests that
+        # only need an authenticated user; the login flow has its own tests
+        api_client.force_authenticate(user=user)
+        return api_client
+
     try:
         login_url = reverse("rest_login")
     except NoReverseMatch:
@@ -135,13 +158,11 @@ def authenticated_client(api_client, create_user, request):
 
     token = response_json["access"]
     api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
-    api_client.user = user  # Store the user object
 
     return api_client
 
 
 @pytest.fixture
-@pytest.mark.django_db
 def quiz_with_questions_fixture(
     teacher_user,
 ):  # Requires a teacher user to assign as owner
@@ -154,34 +175,46 @@ def quiz_with_questions_fixture(
         available_to=timezone.now() + timezone.timedelta(days=1),
     )
 
-    q1 = Question.objects.create(
-        quiz=quiz,
-        question_type=QuestionTypes.SINGLE_MCQ,
-        text="What is the capital of France?",
-        points=2.0,
-    )
-    AnswerOption.objects.create(question=q1, text="Berlin", is_correct=False)
-    AnswerOption.objects.create(question=q1, text="Paris", is_correct=True)
-    AnswerOption.objects.create(question=q1, text="Madrid", is_correct=False)
-
-    q2 = Question.objects.create(
-        quiz=quiz,
-        question_type=QuestionTypes.TRUE_FALSE,
-        text="The Earth is flat.",
-        points=1.0,
-        correct_answer_bool=False,
+    q1, q2, q3 = Question.objects.bulk_create(
+        [
+            Question(
+                quiz=quiz,
+                question_type=QuestionTypes.SINGLE_MCQ,
+                text="What is the capital of France?",
+                points=2.0,
+            ),
+            Question(
+                quiz=quiz,
+                question_type=QuestionTypes.TRUE_FALSE,
+                text="The Earth is flat.",
+                points=1.0,
+                correct_answer_bool=False,
+            ),
+            Question(
+                quiz=quiz,
+                question_type=QuestionTypes.MULTI_MCQ,
+                text="Which are programming languages?",
+                points=3.0,
+            ),
+        ]
     )
-
-    q3 = Question.objects.create(
-        quiz=quiz,
-        question_type=QuestionTypes.MULTI_MCQ,
-        text="Which are programming languages?",
-        points=3.0,
-    )
-    AnswerOption.objects.create(question=q3, text="Python", is_correct=True)
-    AnswerOption.objects.create(question=q3, text="English", is_correct=False)
-    AnswerOption.objects.create(question=q3, text="JavaScript", is_correct=True)
-    AnswerOption.objects.create(question=q3, text="HTML", is_correct=False)
+    options_by_question = {
+        q1: [("Berlin", False), ("Paris", True), ("Madrid", False)],
+        q3: [
+            ("Python", True),
+            ("English", False),
+            ("JavaScript", True),
+            ("HTML", False),
+        ],
+    }
+    for question, options in options_by_question.items():
+        # bulk_create() skips the signal that fills correct_option_ids
+        question.store_correct_option_ids(
+            AnswerOption.objects.bulk_create(
+                AnswerOption(question=question, text=text, is_correct=is_correct)
+                for text, is_correct in options
+            )
+        )
 
     return quiz
 
@@ -210,36 +243,27 @@ def completed_attempt_fixture(
     # Associate the attempt with the user from the authenticated_client
     attempt = QuizAttempt.objects.create(user=user, quiz=quiz)
 
-    # Answer Question 1 (MCQ) - Correct
-    pa1 = ParticipantAnswer.objects.create(
-        attempt=attempt,
-        question=q1,
-        selected_answer_bool=None,
-    )
-    pa1.selected_options.set([q1_correct_option])
-
-    # Answer Question 2 (True/False) - Wrong (select True when correct is False)
-    pa2 = ParticipantAnswer.objects.create(
-        attempt=attempt,
-        question=q2,
-        selected_answer_bool=True,
-    )
-    # pa2.selected_options.set([]) # Redundant for empty ManyToMany
-
-    # Answer Question 3 (Multi-MCQ) - Partially Correct (select Python but miss JavaScript)
     q3_python_option = q3.answer_options.get(text="Python")
-    pa3 = ParticipantAnswer.objects.create(
-        attempt=attempt,
-        question=q3,
-        selected_answer_bool=None,
+    pa1, pa2, pa3 = ParticipantAnswer.objects.bulk_create(
+        [
+            # Answer Question 1 (MCQ) - Correct
+            ParticipantAnswer(attempt=attempt, question=q1, selected_answer_bool=None),
+            # Answer Question 2 (True/False) - Wrong (select True when correct is False)
+            ParticipantAnswer(attempt=attempt, question=q2, selected_answer_bool=True),
+            # Answer Question 3 (Multi-MCQ) - Partially Correct (select Python but miss JavaScript)
+            ParticipantAnswer(attempt=attempt, question=q3, selected_answer_bool=None),
+        ]
+    )
+    # Store the selected options of both MCQ answers with one INSERT
+    SelectedOption = ParticipantAnswer.selected_options.through
+    SelectedOption.objects.bulk_create(
+        [
+            SelectedOption(participantanswer=pa1, answeroption=q1_correct_option),
+            SelectedOption(participantanswer=pa3, answeroption=q3_python_option),
+        ]
     )
-    pa3.selected_options.set([q3_python_option])
 
     # Recalculate correctness and score after creating answers
-    pa1.determine_correctness()
-    pa2.determine_correctness()
-    pa3.determine_correctness()
-
-    attempt.calculate_score()
+    attempt.grade()
 
     return attempt
@@ -2,7 +2,12 @@
 
 import pytest
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, NoReverseMatch
+from django.utils import timezone
+from quiz_app.models import CustomUser, Quiz, QuizAttempt, QuestionTypes
+from quiz_app.serializers import QuizWritableSerializer
 # Fixtures from conftest.py (like authenticated_client, completed_attempt_fixture) are automatically available
 
 
@@ -117,9 +122,6 @@ def test_retrieve_attempt_results_student(
             "question_type"
         )
 
-        # Ensure QuestionTypes is accessible (it should be from conftest imports)
-        from quiz_app.models import QuestionTypes
-
         if sample_pa_question_type == QuestionTypes.TRUE_FALSE.value:
             assert "correct_answer_bool" in sample_pa_data
         elif sample_pa_question_type in [
@@ -131,3 +133,115 @@ def test_retrieve_attempt_results_student(
 
 # You could add tests for a different student attempting to view this attempt (should fail with 403)
 # or for a Teacher/Admin viewing this attempt (should pass).
+
+
+@pytest.mark.django_db
+@pytest.mark.student
+def test_list_attempts_cache(authenticated_client, completed_attempt_fixture):
+    """
+    Test that a repeated list is served from the cache, and that a new
+    submission, a quiz edit or the quiz closing all show up in the next list.
+    """
+    quiz = completed_attempt_fixture.quiz
+    true_false = quiz.questions.get(question_type=QuestionTypes.TRUE_FALSE)
+    list_url = reverse("attempt-list") + "?expand=quiz"
+
+    def get():
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(list_url)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json(), len(queries)
+
+    first, first_queries = get()
+    cached, cached_queries = get()
+    assert cached == first
+    assert cached_queries < first_queries
+
+    # A new submission is listed right away
+    response = authenticated_client.post(
+        reverse("quiz-submit", kwargs={"pk": quiz.pk}),
+        {
+            "quiz_id": quiz.pk,
+            "answers": [{"question_id": true_false.pk, "selected_answer_bool": False}],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    data, _ = get()
+    assert data["count"] == first["count"] + 1
+
+    # So is an edit of the quiz rendered by ?expand=quiz
+    serializer = QuizWritableSerializer(quiz, data={"title": "Renamed"}, partial=True)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    data, _ = get()
+    assert {attempt["quiz"]["title"] for attempt in data["results"]} == {"Renamed"}
+
+    # And the correct answers once the quiz closes, which doesn't touch the quiz's
+    # updated_at when it happens by the clock passing available_to
+    def correct_answer_bools(data):
+        return [
+            answer["correct_answer_bool"]
+            for attempt in data["results"]
+            for answer in attempt["participant_answers"]
+            if answer["question"]["question_type"] == QuestionTypes.TRUE_FALSE
+        ]
+
+    assert correct_answer_bools(data) == [None, None]
+    Quiz.objects.filter(pk=quiz.pk).update(
+        available_to=timezone.now() - timezone.timedelta(seconds=1)
+    )
+    data, _ = get()
+    assert correct_answer_bools(data) == [False, False]
+
+
+@pytest.mark.django_db
+@pytest.mark.student
+@pytest.mark.real_login  # request.user is reloaded on every request, as in production
+def test_list_attempts_cache_follows_user_and_score(
+    authenticated_client, completed_attempt_fixture
+):
+    """
+    Test that marking the student or changing a score outside of a submission
+    (e.g. in the admin) shows up in the next cached list.
+    """
+    attempt = completed_attempt_fixture
+    list_url = reverse("attempt-list")
+
+    def listed():
+        response = authenticated_client.get(list_url)
+        assert response.status_code == status.HTTP_200_OK
+        (data,) = response.json()["results"]
+        return data["user"]["is_marked"], data["score"]
+
+    assert listed() == (False, attempt.score)
+
+    CustomUser.objects.filter(pk=attempt.user_id).update(is_marked=True)
+    assert listed() == (True, attempt.score)
+
+    QuizAttempt.objects.filter(pk=attempt.pk).update(score=0.0)
+    assert listed() == (True, 0.0)
+
+
+@pytest.mark.django_db
+@pytest.mark.teacher
+def test_retrieve_attempt_teacher(
+    authenticated_client, student_user, quiz_with_questions_fixture
+):
+    """
+    Test that a teacher can read attempts on their own quizzes only, and that
+    a refused attempt is decided on the bare attempt row, with a single query.
+    """
+    quiz = quiz_with_questions_fixture  # Owned by another teacher
+    attempt = QuizAttempt.objects.create(user=student_user, quiz=quiz)
+    retrieve_url = reverse("attempt-detail", kwargs={"pk": attempt.pk})
+
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.get(retrieve_url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert len(queries) == 1
+
+    Quiz.objects.filter(pk=quiz.pk).update(teacher=authenticated_client.user)
+    response = authenticated_client.get(retrieve_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == attempt.pk
@@ -0,0 +1,139 @@
+# quiz_app/tests/test_grading.py
+
+import pytest
+from quiz_app.models import (
+    AnswerOption,
+    ParticipantAnswer,
+    Question,
+    QuizAttempt,
+    QuestionTypes,
+)
+from quiz_app.serializers import QuizQuestionWritableSerializer
+from quiz_app.signals import skip_correct_option_ids_refresh
+# Fixtures from conftest.py (like student_user, quiz_with_questions_fixture) are automatically available
+
+
+@pytest.mark.django_db
+def test_recalculate_bulk_scores(student_user, quiz_with_questions_fixture):
+    """Test that recalculate_bulk scores several attempts, including ones with no correct answers."""
+    quiz = quiz_with_questions_fixture
+    q1 = quiz.questions.get(question_type=QuestionTypes.SINGLE_MCQ)  # 2.0 points
+    q3 = quiz.questions.get(question_type=QuestionTypes.MULTI_MCQ)  # 3.0 points
+
+    graded_attempt = QuizAttempt.objects.create(user=student_user, quiz=quiz)
+    ParticipantAnswer.objects.create(attempt=graded_attempt, question=q1, is_correct=True)
+    ParticipantAnswer.objects.create(attempt=graded_attempt, question=q3, is_correct=True)
+
+    empty_attempt = QuizAttempt.objects.create(user=student_user, quiz=quiz, score=9.0)
+    ParticipantAnswer.objects.create(attempt=empty_attempt, question=q1, is_correct=False)
+
+    QuizAttempt.recalculate_bulk([graded_attempt.pk, empty_attempt.pk])
+
+    graded_attempt.refresh_from_db()
+    empty_attempt.refresh_from_db()
+    assert graded_attempt.score == 5.0
+    assert empty_attempt.score == 0.0
+
+
+@pytest.mark.django_db
+def test_grade_many_matches_per_answer_grading(
+    student_user, quiz_with_questions_fixture, django_assert_max_num_queries
+):
+    """Test that grade_many grades a whole attempt in a constant number of queries."""
+    quiz = quiz_with_questions_fixture
+    q1 = quiz.questions.get(question_type=QuestionTypes.SINGLE_MCQ)
+    q2 = quiz.questions.get(question_type=QuestionTypes.TRUE_FALSE)
+    q3 = quiz.questions.get(question_type=QuestionTypes.MULTI_MCQ)
+
+    attempt = QuizAttempt.objects.create(user=student_user, quiz=quiz)
+    pa1 = ParticipantAnswer.objects.create(attempt=attempt, question=q1)
+    pa1.selected_options.set([q1.answer_options.get(text="Paris")])
+    ParticipantAnswer.objects.create(
+        attempt=attempt, question=q2, selected_answer_bool=True
+    )
+    pa3 = ParticipantAnswer.objects.create(attempt=attempt, question=q3)
+    pa3.selected_options.set([q3.answer_options.get(text="Python")])
+
+    # 1 answers+questions, 1 selected options prefetch, 1 bulk UPDATE
+    with django_assert_max_num_queries(3):
+        ParticipantAnswer.grade_many(attempt.participant_answers.all())
+
+    graded = dict(attempt.participant_answers.values_list("question_id", "is_correct"))
+    assert graded == {q1.pk: True, q2.pk: False, q3.pk: False}
+
+
+@pytest.mark.django_db
+def test_correct_option_ids_follow_answer_option_changes(quiz_with_questions_fixture):
+    """Test that saving or deleting an AnswerOption refreshes Question.correct_option_ids."""
+    q3 = quiz_with_questions_fixture.questions.get(
+        question_type=QuestionTypes.MULTI_MCQ
+    )
+    python = q3.answer_options.get(text="Python")
+    javascript = q3.answer_options.get(text="JavaScript")
+    html = q3.answer_options.get(text="HTML")
+
+    def stored_ids():
+        return set(Question.objects.get(pk=q3.pk).correct_option_ids)
+
+    assert stored_ids() == {python.pk, javascript.pk}
+
+    html.is_correct = True
+    html.save()
+    assert stored_ids() == {python.pk, javascript.pk, html.pk}
+
+    javascript.delete()
+    assert stored_ids() == {python.pk, html.pk}
+
+    AnswerOption.objects.filter(pk=python.pk).update(is_correct=False)
+    Question.refresh_correct_option_ids(q3.pk)
+    assert stored_ids() == {html.pk}
+
+
+@pytest.mark.django_db
+def test_sync_answer_options_deletes_stale_options(
+    student_user, quiz_with_questions_fixture
+):
+    """
+    Test that options dropped from a question update are deleted along with their
+    selections, and that correct_option_ids is stored once for the question.
+    """
+    q3 = quiz_with_questions_fixture.questions.get(
+        question_type=QuestionTypes.MULTI_MCQ
+    )
+    python = q3.answer_options.get(text="Python")
+    javascript = q3.answer_options.get(text="JavaScript")
+    attempt = QuizAttempt.objects.create(user=student_user, quiz=q3.quiz)
+    answer = ParticipantAnswer.objects.create(attempt=attempt, question=q3)
+    answer.selected_options.set([python, javascript])
+
+    serializer = QuizQuestionWritableSerializer(
+        q3,
+        data={
+            "answer_options": [
+                {"id": python.pk, "text": "Python", "is_correct": True},
+                {"text": "Rust", "is_correct": True},
+            ]
+        },
+        partial=True,
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+    options = {o.text: o.pk for o in q3.answer_options.all()}
+    assert set(options) == {"Python", "Rust"}
+    assert set(Question.objects.get(pk=q3.pk).correct_option_ids) == {
+        python.pk,
+        options["Rust"],
+    }
+    assert list(answer.selected_options.values_list("pk", flat=True)) == [python.pk]
+
+    # Inside skip_correct_option_ids_refresh() the stored IDs are left to the
+    # caller, while other bulk deletes of options still refresh them
+    with skip_correct_option_ids_refresh():
+        AnswerOption.objects.filter(pk=options["Rust"]).delete()
+    assert set(Question.objects.get(pk=q3.pk).correct_option_ids) == {
+        python.pk,
+        options["Rust"],
+    }
+    AnswerOption.objects.filter(pk=python.pk).delete()
+    assert Question.objects.get(pk=q3.pk).correct_option_ids == []
@@ -3,6 +3,8 @@
 import pytest
 from rest_framework import status
 from django.urls import reverse, NoReverseMatch
+from quiz_app.models import AnswerOption
+from quiz_app.serializers import QuizQuestionWritableSerializer, QuizWritableSerializer
 # Fixtures from conftest.py (like authenticated_client, quiz_with_questions_fixture) are automatically available
 
 
@@ -89,4 +91,78 @@ def test_retrieve_quiz_student(authenticated_client, quiz_with_questions_fixture
             )
 
 
+@pytest.mark.django_db
+@pytest.mark.student
+def test_retrieve_quiz_etag(authenticated_client, quiz_with_questions_fixture):
+    """Test that a quiz detail GET revalidates with its ETag until the quiz changes."""
+    quiz = quiz_with_questions_fixture
+    retrieve_url = reverse("quiz-detail", kwargs={"pk": quiz.pk})
+
+    def get(etag):
+        return authenticated_client.get(retrieve_url, HTTP_IF_NONE_MATCH=etag)
+
+    response = authenticated_client.get(retrieve_url)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response["ETag"]
+    assert get(etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Editing the quiz through the write serializer moves the ETag
+    serializer = QuizWritableSerializer(quiz, data={"title": "Renamed"}, partial=True)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    response = get(etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "Renamed"
+    etag = response["ETag"]
+
+    # So does a change to the teacher details embedded in the response
+    quiz.teacher.username = "renamed_teacher"
+    quiz.teacher.save()
+    response = get(etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["teacher"]["username"] == "renamed_teacher"
+
+
+@pytest.mark.django_db
+@pytest.mark.student
+def test_retrieve_quiz_etag_follows_questions(
+    authenticated_client, quiz_with_questions_fixture
+):
+    """
+    Test that the quiz ETag moves when its questions or options change outside
+    of QuizWritableSerializer, and that the response varies on Accept.
+    """
+    quiz = quiz_with_questions_fixture
+    retrieve_url = reverse("quiz-detail", kwargs={"pk": quiz.pk})
+    response = authenticated_client.get(retrieve_url)
+    assert "Accept" in response["Vary"]
+    etag = response["ETag"]
+
+    def refetch():
+        nonlocal etag
+        response = authenticated_client.get(retrieve_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+        return {q["text"]: q for q in response.json()["questions"]}
+
+    # The question serializer used on its own
+    question = quiz.questions.get(text="The Earth is flat.")
+    serializer = QuizQuestionWritableSerializer(
+        question, data={"text": "The Earth is round."}, partial=True
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    assert "The Earth is round." in refetch()
+
+    # An option saved or a question deleted directly, e.g. in the admin
+    option = AnswerOption.objects.get(text="Berlin", question__quiz=quiz)
+    option.text = "Lyon"
+    option.save()
+    options = refetch()["What is the capital of France?"]["answer_options"]
+    assert "Lyon" in [o["text"] for o in options]
+
+    question.delete()
+    assert "The Earth is round." not in refetch()
+
+
 # You could add tests for marked students attempting to view quizzes if permissions differ.
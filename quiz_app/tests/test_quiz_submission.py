@@ -3,6 +3,8 @@
 import pytest
 from rest_framework import status
 from django.urls import reverse, NoReverseMatch
+from django.utils import timezone
+from quiz_app.models import Quiz
 # Fixtures from conftest.py (like authenticated_client, quiz_with_questions_fixture) are automatically available
 
 
@@ -88,3 +90,110 @@ def test_submit_quiz_attempt_student(authenticated_client, quiz_with_questions_f
 
 # You could add tests for submitting as a marked student (should fail),
 # submitting after the window closes, submitting invalid data, etc.
+
+
+@pytest.mark.django_db
+@pytest.mark.student
+def test_submit_invalid_option_id_returns_400(
+    authenticated_client, quiz_with_questions_fixture
+):
+    """Test that a malformed option ID is reported as a 400 validation error."""
+    quiz = quiz_with_questions_fixture
+    q3 = quiz.questions.get(text="Which are programming languages?")
+    submit_url = reverse("quiz-submit", kwargs={"pk": quiz.pk})
+
+    response = authenticated_client.post(
+        submit_url,
+        {
+            "quiz_id": quiz.pk,
+            "answers": [{"question_id": q3.pk, "selected_option_ids": ["abc"]}],
+        },
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    # List item errors are keyed by the item's index, rendered as a string key
+    assert response.json() == {
+        "answers": {
+            "0": {"selected_option_ids": {"0": ["A valid integer is required."]}}
+        }
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.student
+def test_submit_response_matches_attempt_detail(
+    authenticated_client, quiz_with_questions_fixture
+):
+    """
+    Test that the submit response, rendered from the stored attempt,
+    is the same as the stored attempt's detail, duplicate option IDs included.
+    """
+    quiz = quiz_with_questions_fixture
+    q1 = quiz.questions.get(text="What is the capital of France?")
+    q2 = quiz.questions.get(text="The Earth is flat.")
+    q3 = quiz.questions.get(text="Which are programming languages?")
+    python = q3.answer_options.get(text="Python")
+    javascript = q3.answer_options.get(text="JavaScript")
+
+    response = authenticated_client.post(
+        reverse("quiz-submit", kwargs={"pk": quiz.pk}),
+        {
+            "quiz_id": quiz.pk,
+            "answers": [
+                {
+                    "question_id": q1.pk,
+                    "selected_option_ids": [q1.answer_options.get(text="Paris").pk],
+                },
+                {"question_id": q2.pk, "selected_answer_bool": False},
+                {
+                    "question_id": q3.pk,
+                    "selected_option_ids": [python.pk, python.pk, javascript.pk],
+                },
+            ],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    submitted = response.json()
+
+    answers = {a["question"]["id"]: a for a in submitted["participant_answers"]}
+    assert [o["id"] for o in answers[q3.pk]["selected_options"]] == [
+        python.pk,
+        javascript.pk,
+    ]
+    assert answers[q3.pk]["is_correct"] is True
+    assert submitted["score"] == 6.0
+
+    detail = authenticated_client.get(
+        reverse("attempt-detail", kwargs={"pk": submitted["id"]})
+    )
+    assert detail.status_code == status.HTTP_200_OK
+    assert submitted == detail.json()
+
+
+@pytest.mark.django_db
+@pytest.mark.student
+def test_submit_rejected_right_after_window_closes(
+    authenticated_client, quiz_with_questions_fixture
+):
+    """Test that availability is decided afresh, not from a value cached earlier."""
+    quiz = quiz_with_questions_fixture
+    assert quiz.is_available_for_submission
+
+    # Close the window without signals, as a bulk update or another process would
+    Quiz.objects.filter(pk=quiz.pk).update(
+        available_to=timezone.now() - timezone.timedelta(seconds=1)
+    )
+    assert not Quiz.objects.get(pk=quiz.pk).is_available_for_submission
+
+    q2 = quiz.questions.get(text="The Earth is flat.")
+    response = authenticated_client.post(
+        reverse("quiz-submit", kwargs={"pk": quiz.pk}),
+        {
+            "quiz_id": quiz.pk,
+            "answers": [{"question_id": q2.pk, "selected_answer_bool": False}],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,56 @@
+# quiz_app/tests/test_quiz_update.py
+
+import pytest
+from quiz_app.models import QuestionTypes
+from quiz_app.serializers import QuizWritableSerializer
+# Fixtures from conftest.py (like quiz_with_questions_fixture) are automatically available
+
+
+@pytest.mark.django_db
+def test_update_quiz_questions(quiz_with_questions_fixture):
+    """Test that an update with questions data updates, creates and deletes questions."""
+    quiz = quiz_with_questions_fixture
+    q1 = quiz.questions.get(question_type=QuestionTypes.SINGLE_MCQ)
+    q2 = quiz.questions.get(question_type=QuestionTypes.TRUE_FALSE)
+    paris = q1.answer_options.get(text="Paris")
+
+    serializer = QuizWritableSerializer(
+        quiz,
+        data={
+            "questions": [
+                {
+                    "id": q1.pk,
+                    "question_type": QuestionTypes.SINGLE_MCQ,
+                    "text": "What is the capital of Spain?",
+                    "points": 2.0,
+                    "answer_options": [
+                        {"id": paris.pk, "text": "Paris", "is_correct": False},
+                        {"text": "Madrid", "is_correct": True},
+                    ],
+                },
+                {
+                    "id": q2.pk,
+                    "question_type": QuestionTypes.TRUE_FALSE,
+                    "text": "The Earth is round.",
+                    "points": 1.0,
+                    "correct_answer_bool": True,
+                },
+            ]
+        },
+        partial=True,
+    )
+    assert serializer.is_valid(), serializer.errors
+    serializer.save()
+
+    # The MULTI_MCQ question was left out of the data, so it is deleted
+    assert set(quiz.questions.values_list("id", flat=True)) == {q1.pk, q2.pk}
+
+    q1.refresh_from_db()
+    q2.refresh_from_db()
+    assert q1.text == "What is the capital of Spain?"
+    assert q2.correct_answer_bool is True
+
+    options = {o.text: o for o in q1.answer_options.all()}
+    assert set(options) == {"Paris", "Madrid"}
+    assert options["Paris"].pk == paris.pk and not options["Paris"].is_correct
+    assert q1.correct_option_ids == [options["Madrid"].pk]
@@ -9,6 +9,7 @@ from django.urls import reverse, NoReverseMatch
 # Manual Test 3: View User Details
 @pytest.mark.django_db
 @pytest.mark.student  # Authenticate as a student
+@pytest.mark.real_login  # Go through the JWT login flow end to end
 def test_retrieve_user_details_student(authenticated_client):
     """Test that an authenticated student can retrieve their own user details."""
     try:
@@ -1,11 +1,19 @@
 # quiz_app/views.py
+import hashlib
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, AllowAny, IsAuthenticated
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Now
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from django.utils import timezone
+from django.views.decorators.http import etag
+from django.views.decorators.vary import vary_on_headers
 
 from .models import (
     CustomUser,
@@ -14,7 +22,6 @@ from .models import (
     ParticipantAnswer,
     Roles,
     QuestionTypes,
-    AnswerOption,
 )
 from .serializers import (
     UserSerializer,
@@ -37,6 +44,48 @@ from dj_rest_auth.registration.views import SocialLoginView
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 
+# How long a rendered attempts list page may be served from the cache
+ATTEMPT_LIST_CACHE_SECONDS = 60
+
+
+def wants_expanded_quiz(request):
+    """
+    Whether the caller asked for the full quiz tree in attempt results,
+    e.g. `?expand=quiz` (comma-separated values are accepted).
+    """
+    expand = request.query_params.get("expand", "")
+    return "quiz" in expand.split(",")
+
+
+# The teacher's columns embedded in a quiz detail response (through
+# UserSerializer), so renaming the teacher changes the quiz's ETag as well
+_QUIZ_ETAG_TEACHER_FIELDS = [f"teacher__{name}" for name in UserSerializer.Meta.fields]
+
+
+def quiz_etag(request, pk=None):
+    """
+    ETag of a quiz detail response. It changes whenever the quiz or its
+    questions are edited, when the embedded teacher details change, and when
+    the quiz opens or closes for submission, so clients can revalidate with one
+    small SELECT instead of a full reload.
+    """
+    row = (
+        Quiz.objects.filter(pk=pk)
+        .values(
+            "updated_at", "available_from", "available_to", *_QUIZ_ETAG_TEACHER_FIELDS
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    available = Quiz(
+        available_from=row["available_from"], available_to=row["available_to"]
+    )._compute_available(timezone.now())
+    teacher = hashlib.sha1(
+        repr([row[field] for field in _QUIZ_ETAG_TEACHER_FIELDS]).encode()
+    ).hexdigest()[:16]
+    return f"{pk}-{row['updated_at'].timestamp()}-{int(available)}-{teacher}"
+
 
 class CustomGoogleOAuth2Client(OAuth2Client):
     def __init__(
@@ -87,6 +136,26 @@ class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsAdminUser]  # Only Admins can CRUD users
 
+    def _set_marked(self, is_marked, verb):
+        # get_queryset() loads just the role and flag, and only the flag is written
+        user = self.get_object()
+        if not user.is_student():
+            return Response(
+                {"detail": f"Only student users can be {verb}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if user.is_marked != is_marked:
+            user.is_marked = is_marked
+            user.save(update_fields=["is_marked"])
+        return Response({"status": f"student {verb}"}, status=status.HTTP_200_OK)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("mark_student", "unmark_student"):
+            return queryset.only("id", "role", "is_marked")
+        return queryset
+
     @action(
         detail=True,
         methods=["post"],
@@ -94,16 +163,7 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def mark_student(self, request, pk=None):
         """Mark a student user."""
-        user = self.get_object()
-        if not user.is_student():
-            return Response(
-                {"detail": "Only student users can be marked."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        user.is_marked = True
-        user.save()
-        return Response({"status": "student marked"}, status=status.HTTP_200_OK)
+        return self._set_marked(True, "marked")
 
     @action(
         detail=True,
@@ -112,22 +172,11 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def unmark_student(self, request, pk=None):
         """Unmark a student user."""
-        user = self.get_object()
-        if not user.is_student():
-            return Response(
-                {"detail": "Only student users can be unmarked."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        user.is_marked = False
-        user.save()
-        return Response({"status": "student unmarked"}, status=status.HTTP_200_OK)
+        return self._set_marked(False, "unmarked")
 
 
 class QuizViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Quiz.objects.prefetch_related("questions__answer_options").all().order_by("id")
-    )
+    queryset = Quiz.objects.all().order_by("id")
     # serializer_class will be determined by get_serializer_class
     # permission_classes will be determined by get_permissions
 
@@ -139,6 +188,12 @@ class QuizViewSet(viewsets.ModelViewSet):
         # For list, retrieve, and the submit action, use the read-only serializer
         return QuizReadOnlySerializer
 
+    def get_queryset(self):
+        # Load the relations rendered by the read-only serializer up front
+        return Quiz.annotate_availability(
+            QuizReadOnlySerializer.setup_eager_loading(super().get_queryset())
+        )
+
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
@@ -157,6 +212,15 @@ class QuizViewSet(viewsets.ModelViewSet):
             # Allow any user (authenticated or unauthenticated) to list/retrieve quizzes
             return [AllowAny()]
 
+    # The detail response is the same for every user, so a client sending the
+    # ETag it got back receives a 304 without the quiz tree being reloaded. It
+    # does depend on the renderer picked from the Accept header (JSON or the
+    # browsable API) while the ETag doesn't, hence Vary: Accept for caches.
+    @method_decorator(vary_on_headers("Accept"))
+    @method_decorator(etag(quiz_etag))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         # Assign the logged-in user as the teacher for the quiz
         serializer.save(teacher=self.request.user)
@@ -171,8 +235,11 @@ class QuizViewSet(viewsets.ModelViewSet):
         # The permission class IsStudent and ~IsMarkedStudent already check the user role and marked status.
 
         # Validate the submission payload
-        # Pass the quiz instance to the serializer context if needed for specific validation
-        serializer = self.get_serializer(data=request.data)
+        # Pass the quiz instance (loaded by get_queryset() with its questions and
+        # options) so the serializer validates against it instead of loading it again
+        serializer = self.get_serializer(
+            data=request.data, context={**self.get_serializer_context(), "quiz": quiz}
+        )
         serializer.is_valid(raise_exception=True)
 
         validated_data = serializer.validated_data
@@ -185,8 +252,13 @@ class QuizViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Double-check availability (can be done in serializer validation too, doing both for safety)
-        if not quiz.is_available_for_submission:
+        # Double-check availability (can be done in serializer validation too, doing both for safety).
+        # Reuse the serializer's result for this quiz instead of evaluating it again.
+        ctx = serializer.context.get("_ctx")
+        is_available = ctx.is_available if ctx is not None else None
+        if is_available is None:
+            is_available = quiz.is_available_for_submission
+        if not is_available:
             return Response(
                 {"detail": "This quiz is not currently available for submission."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -197,52 +269,79 @@ class QuizViewSet(viewsets.ModelViewSet):
             # Create the QuizAttempt
             attempt = QuizAttempt.objects.create(user=request.user, quiz=quiz)
 
-            # Process each submitted answer
-            for answer_data in answers_data:
-                question_id = answer_data["question_id"]
-                selected_option_ids = answer_data.get("selected_option_ids", [])
-                selected_answer_bool = answer_data.get("selected_answer_bool")
-
-                # Fetch the question (already validated to exist and belong to the quiz by the serializer)
-                question = quiz.questions.get(
-                    id=question_id
-                )  # Use get() as we know it exists
+            # The submitted questions were already validated to exist and belong
+            # to the quiz by the serializer, which loaded all of them for that;
+            # look them up in its map instead of querying them again
+            questions_by_id = ctx.questions_by_id
 
-                # Create the ParticipantAnswer
-                participant_answer = ParticipantAnswer.objects.create(
+            # Build and grade each ParticipantAnswer in memory
+            participant_answers = []
+            for answer_data in answers_data:
+                question = questions_by_id[answer_data["question_id"]]
+                participant_answer = ParticipantAnswer(
                     attempt=attempt,
                     question=question,
-                    selected_answer_bool=selected_answer_bool,  # Set boolean answer
+                    selected_answer_bool=answer_data.get(
+                        "selected_answer_bool"
+                    ),  # Set boolean answer
                 )
-
-                # Set selected options for MCQ types
+                # Selected options for MCQ types, read by determine_correctness().
+                # The serializer checked they belong to the question, so they are
+                # taken from the question's prefetched options, not the database.
+                selected_option_ids = answer_data.get("selected_option_ids", [])
                 if selected_option_ids:
-                    selected_options = AnswerOption.objects.filter(
-                        id__in=selected_option_ids
+                    options_by_id = {o.id: o for o in question.answer_options.all()}
+                    # An option sent twice is stored once (one through row), so
+                    # it is also graded and rendered once
+                    participant_answer._selected = [
+                        options_by_id[option_id]
+                        for option_id in dict.fromkeys(selected_option_ids)
+                        if option_id in options_by_id
+                    ]
+                else:
+                    participant_answer._selected = []
+                participant_answer.determine_correctness()
+                participant_answers.append(participant_answer)
+
+            # Insert all answers, then all of their selected options, in batches
+            ParticipantAnswer.objects.bulk_create(participant_answers, batch_size=5000)
+            SelectedOption = ParticipantAnswer.selected_options.through
+            SelectedOption.objects.bulk_create(
+                [
+                    SelectedOption(
+                        participantanswer_id=participant_answer.pk,
+                        answeroption_id=option.pk,
                     )
-                    participant_answer.selected_options.set(selected_options)
-
-                # Determine and save the correctness of the answer
-                participant_answer.determine_correctness()  # This also calls save()
+                    for participant_answer in participant_answers
+                    for option in participant_answer._selected
+                ],
+                batch_size=5000,
+            )
 
             # Calculate and save the overall score for the attempt
-            attempt.calculate_score()  # This also calls save()
+            attempt.calculate_score()
+
+        # Render the stored attempt the way the attempt detail endpoint does, so
+        # the response shows exactly what was saved
+        expand_quiz = wants_expanded_quiz(request)
+        attempt = QuizAttempt.annotate_leaderboard(
+            QuizAttemptResultSerializer.setup_eager_loading(
+                QuizAttempt.objects.filter(pk=attempt.pk), expand_quiz=expand_quiz
+            )
+        ).get()
 
         # Return the results of the attempt
-        result_serializer = QuizAttemptResultSerializer(attempt)
+        result_serializer = QuizAttemptResultSerializer(
+            attempt, context={"expand_quiz": expand_quiz, "include_rank": True}
+        )
         return Response(result_serializer.data, status=status.HTTP_201_CREATED)
 
 
 class QuizAttemptViewSet(viewsets.ReadOnlyModelViewSet):
     # ReadOnlyModelViewSet as attempts are created via the Quiz submit action
-    queryset = (
-        QuizAttempt.objects.select_related("user", "quiz")
-        .prefetch_related(
-            "participant_answers__question__answer_options",  # Prefetch for ParticipantAnswerResultSerializer
-            "participant_answers__selected_options",  # Prefetch selected options
-        )
-        .all()
-        .order_by("-submission_time")
+    # Related rows are loaded by QuizAttemptResultSerializer.setup_eager_loading()
+    queryset = QuizAttempt.objects.all().order_by(
+        "-submission_time"
     )  # Order by most recent attempt first
 
     serializer_class = QuizAttemptResultSerializer
@@ -260,21 +359,116 @@ class QuizAttemptViewSet(viewsets.ReadOnlyModelViewSet):
             IsAttemptOwnerOrTeacherOrAdmin(),
         ]  # Check object perm for retrieve
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand_quiz"] = wants_expanded_quiz(self.request)
+        # Rank is only shown on a single attempt, so lists skip computing it
+        context["include_rank"] = self.action == "retrieve"
+        return context
+
+    def get_object(self):
+        # get_queryset() already limits students to their own attempts and
+        # admins may see any, so only a teacher can be refused an attempt it
+        # finds. Check a teacher's access on the bare attempt row first, so a
+        # refused request doesn't pay for the prefetched answer tree.
+        if not self.request.user.is_teacher():
+            return super().get_object()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        attempt = get_object_or_404(
+            QuizAttempt.objects.select_related("quiz").only(
+                "user_id", "quiz__teacher_id"
+            ),
+            **lookup,
+        )
+        self.check_object_permissions(self.request, attempt)
+        # Access was just granted on the same attempt, so the full attempt is
+        # fetched without running the object permissions a second time
+        return get_object_or_404(self.filter_queryset(self.get_queryset()), **lookup)
+
+    def list_cache_key(self):
+        """
+        Cache key of the requested attempts page for the requesting student.
+
+        The key embeds everything the rendered page depends on that can change
+        under it: the number of attempts and the newest submission time (a new
+        submission or a deleted attempt), the sum of their scores (a regraded or
+        admin-edited attempt), the newest edit of the attempted quizzes
+        (questions and options shown with `?expand=quiz`, or answers removed
+        with a deleted question), how many of those quizzes have closed (their
+        correct answers become visible), and the student's own details embedded
+        in every attempt. Any such change moves the list to a fresh key and the
+        stale page simply expires.
+        """
+        user = self.request.user
+        version = QuizAttempt.objects.filter(user=user).aggregate(
+            total=Count("*"),
+            latest=Max("submission_time"),
+            score=Sum("score"),
+            quizzes_updated=Max("quiz__updated_at"),
+            quizzes_closed=Count(
+                "quiz", distinct=True, filter=Q(quiz__available_to__lt=Now())
+            ),
+        )
+        # request.user is loaded by the authentication on every request, so its
+        # fields are as fresh as the attempts' joined user rows
+        parts = [
+            *version.values(),
+            *(getattr(user, name) for name in UserSerializer.Meta.fields),
+            self.request.get_full_path(),
+        ]
+        # Hashed so the query string can't push the key past memcached's limit
+        # of 250 characters, or bring spaces into it
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+        return f"attempts:list:{user.pk}:{digest}"
+
+    def list(self, request, *args, **kwargs):
+        # Teachers and admins list every attempt, where building the key would
+        # scan the whole table on each request, so only students are cached
+        if not request.user.is_student():
+            return super().list(request, *args, **kwargs)
+        # Serve repeat GETs of an unchanged list without re-running the
+        # prefetches and serialization
+        key = self.list_cache_key()
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, ATTEMPT_LIST_CACHE_SECONDS)
+        return Response(data)
+
     def get_queryset(self):
         """
         Filters attempts based on user role. Students see only their own.
         Teachers/Admins see all.
         """
+        # Join the relations checked by IsAttemptOwnerOrTeacherOrAdmin
+        queryset = IsAttemptOwnerOrTeacherOrAdmin.apply_queryset_hints(
+            QuizAttemptResultSerializer.setup_eager_loading(
+                self.queryset, expand_quiz=wants_expanded_quiz(self.request)
+            )
+        )
+        # Let the database compute each attempt's best score (and, on detail, its
+        # rank) in the same query
+        if self.action == "retrieve":
+            queryset = QuizAttempt.annotate_leaderboard(queryset)
+        else:
+            queryset = QuizAttempt.annotate_best_score(queryset)
+        return self.scope_to_user(queryset)
+
+    def scope_to_user(self, queryset):
+        """
+        Restricts the attempts to the ones the requesting user may see.
+        """
         user = self.request.user
         if user.is_authenticated:
             if user.is_student():
                 # Students only see their own attempts
-                return self.queryset.filter(user=user)
+                return queryset.filter(user=user)
             else:  # Teacher or Admin
                 # Teachers and Admins see all attempts
-                return self.queryset.all()
+                return queryset.all()
         # Unauthenticated users should not see attempts (handled by IsAuthenticated)
-        return self.queryset.none()
+        return queryset.none()
 
     # No need to override `retrieve` explicitly if `IsAttemptOwnerOrTeacherOrAdmin`
     # is in `get_permissions` and `get_object()` is used (which it is by default).
@@ -100,6 +100,10 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Keep connections open between requests instead of reconnecting for
+        # every request; checked before reuse so a dropped one is replaced
+        "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", default=60),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -166,6 +170,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",  # Default to requiring auth unless specified otherwise
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "quiz_app.renderers.ORJSONRenderer",  # Faster drop-in for JSONRenderer
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,  # Example pagination size
 }
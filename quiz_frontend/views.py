@@ -2,12 +2,17 @@
 
 from django.shortcuts import render, get_object_or_404, redirect  # Import redirect
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.utils import timezone
+from django.views.decorators.cache import cache_page, never_cache
+from django.views.decorators.vary import vary_on_cookie
 from django.urls import reverse  # Import reverse for redirecting to URLs by name
-from django.db.models import Q
+from django.db.models import Prefetch, prefetch_related_objects
 
 # Import models needed for these views
 from quiz_app.models import (
+    AVAILABILITY_CACHE_SECONDS,
     Quiz,
     QuizAttempt,
     ParticipantAnswer,
@@ -15,35 +20,67 @@ from quiz_app.models import (
     AnswerOption,
     QuestionTypes,
 )  # Make sure QuestionTypes is imported
+
+# Number of attempts listed per page on the attempts page
+ATTEMPTS_PER_PAGE = 25
+
+# How long the homepage rendered for anonymous visitors is served from the cache
+INDEX_CACHE_SECONDS = 60 * 15
+
 # --- Existing Views ---
 
 
+def _render_index(request):
+    context = {}
+    return render(request, "quiz_frontend/index.html", context)
+
+
+# Every anonymous visitor gets the same homepage, so it is rendered once and
+# served from the server-side cache. The cookies are part of the cache key, so
+# a visitor with pending messages never gets someone else's copy, and browsers
+# are told not to keep it, as the same URL shows a different page after login.
+_cached_anonymous_index = never_cache(
+    cache_page(INDEX_CACHE_SECONDS)(vary_on_cookie(_render_index))
+)
+
+
 def index(request):
     """
     View for the homepage.
     """
-    context = {}
-    return render(request, "quiz_frontend/index.html", context)
+    # Logged-in users see their name on the page, so theirs is rendered per request
+    if request.user.is_authenticated:
+        return _render_index(request)
+    return _cached_anonymous_index(request)
 
 
 @login_required
 def quiz_list_view(request):
     """
     View to display a list of quizzes available to the logged-in student.
-    Includes quizzes with a set availability window and those with no window defined.
+    Uses the same availability rules as quiz submission (see
+    Quiz.is_available_for_submission): a quiz is listed when no window is set or
+    the current time falls inside it.
     """
-    now = timezone.now()
-
-    # Condition 1: Within the defined availability window
-    available_by_dates = Q(available_from__lte=now, available_to__gte=now)
-
-    # Condition 2: No availability window set (considered always available)
-    available_by_default = Q(available_from__isnull=True, available_to__isnull=True)
-
-    # Combine the conditions using OR (|) and filter the Quiz objects
-    available_quizzes = Quiz.objects.filter(
-        available_by_dates | available_by_default
-    ).order_by("available_from")  # You can adjust ordering as needed
+    # The list is the same for every student and only changes when a window
+    # opens or closes or a quiz is edited, so share it through the cache for
+    # the current time bucket. It may lag by up to AVAILABILITY_CACHE_SECONDS:
+    # saving a quiz drops the cached copy only from the cache that process
+    # uses, which with the default per-process LocMemCache leaves other
+    # workers' copies in place until their bucket expires (a shared backend
+    # such as Redis or Memcached removes that lag). Taking a quiz is unaffected,
+    # as quiz_detail_view and submission check availability afresh.
+    cache_key = Quiz.available_list_cache_key()
+    available_quizzes = cache.get(cache_key)
+    if available_quizzes is None:
+        # Only the fields the list renders, as plain dicts; they are also what
+        # gets pickled into the cache
+        available_quizzes = list(
+            Quiz.available_qs()
+            .order_by("available_from")  # You can adjust ordering as needed
+            .values("pk", "title", "timing_minutes")
+        )
+        cache.set(cache_key, available_quizzes, AVAILABILITY_CACHE_SECONDS)
 
     context = {"quizzes": available_quizzes}
     return render(request, "quiz_frontend/quiz_list.html", context)
@@ -78,13 +115,22 @@ def attempt_list_view(request):
     View to display a list of all quiz attempts made by the authenticated user.
     Fetches attempts directly using the ORM.
     """
-    # Fetch attempts related to the current user
-    user_attempts = QuizAttempt.objects.filter(user=request.user).order_by(
-        "-submission_time"
-    )  # Order by most recent
+    # Fetch attempts related to the current user, joined with their quiz
+    user_attempts = (
+        QuizAttempt.objects.filter(user=request.user)
+        .select_related("quiz")
+        .order_by("-submission_time")  # Order by most recent
+    )
+    # Render one page at a time, so a long history doesn't load every attempt
+    page_obj = Paginator(user_attempts, ATTEMPTS_PER_PAGE).get_page(
+        request.GET.get("page")
+    )
+    # Each row shows its quiz's total points; sum them for the page at once
+    Quiz.prefill_total_points(attempt.quiz for attempt in page_obj)
 
     context = {
-        "attempts": user_attempts,
+        "attempts": page_obj.object_list,
+        "page_obj": page_obj,
     }
     return render(
         request, "quiz_frontend/attempt_list.html", context
@@ -100,16 +146,21 @@ def attempt_detail_view(request, pk):
     """
     # Fetch the specific attempt, ensure it belongs to the logged-in user
     # get_object_or_404 will raise a 404 if the attempt doesn't exist or doesn't belong to the user
-    attempt = get_object_or_404(QuizAttempt, pk=pk, user=request.user)
+    # The quiz is rendered alongside the attempt, so join it in the same query
+    attempt = get_object_or_404(
+        QuizAttempt.objects.select_related("quiz"), pk=pk, user=request.user
+    )
 
-    # Fetch the participant answers related to this attempt
+    # Fetch the participant answers related to this attempt, with their
+    # selected options (only the text is rendered) in one more query
     participant_answers = attempt.participant_answers.select_related(
         "question"
-    ).prefetch_related("selected_options")
+    ).prefetch_related(
+        Prefetch("selected_options", queryset=AnswerOption.objects.only("id", "text"))
+    )
 
     # You need the quiz object to determine if correct answers should be shown
     quiz = attempt.quiz
-    print(attempt.score)
     show_correct_answers = False  # Default is not to show
 
     # Check if correct answers should be shown based on quiz availability
@@ -126,6 +177,18 @@ def attempt_detail_view(request, pk):
     ):
         show_correct_answers = True
     # --- End Corrected Check ---
+    if show_correct_answers:
+        # Load the correct options of all answered questions in one query,
+        # instead of one answer_options query per question in the template
+        participant_answers = participant_answers.prefetch_related(
+            Prefetch(
+                "question__answer_options",
+                queryset=AnswerOption.objects.filter(is_correct=True)
+                .only("id", "question_id", "text")
+                .order_by("id"),
+                to_attr="correct_answer_options",
+            )
+        )
     context = {
         "attempt": attempt,
         "participant_answers": participant_answers,
@@ -147,23 +210,36 @@ def quiz_detail_view(request, pk):
     """
     View to display a specific quiz for the user to take.
     """
+    # Load the quiz with only the columns the quiz-taking form reads, and let
+    # the database evaluate its availability in the same query
     quiz = get_object_or_404(
-        Quiz.objects.prefetch_related("questions__answer_options"), pk=pk
+        Quiz.annotate_availability(
+            Quiz.objects.only("id", "title", "timing_minutes")
+        ),
+        pk=pk,
     )
 
-    now = timezone.now()
+    # Availability check, with the same rules the submission endpoint applies
+    if not quiz.is_available_for_submission:
+        return redirect(reverse("quiz_list"))
 
-    # Availability check
-    is_available_by_dates = (
-        quiz.available_from is not None
-        and quiz.available_to is not None
-        and quiz.available_from <= now
-        and now <= quiz.available_to
+    # Only a quiz that can be taken needs its questions and options: load them
+    # now, in a stable order and with only the columns the form renders
+    prefetch_related_objects(
+        [quiz],
+        Prefetch(
+            "questions",
+            queryset=Question.objects.only(
+                "id", "quiz_id", "text", "points", "question_type"
+            ).order_by("id"),
+        ),
+        Prefetch(
+            "questions__answer_options",
+            queryset=AnswerOption.objects.only("id", "question_id", "text").order_by(
+                "id"
+            ),
+        ),
     )
-    is_available_by_default = quiz.available_from is None and quiz.available_to is None
-
-    if not (is_available_by_dates or is_available_by_default):
-        return redirect(reverse("quiz_list"))
 
     # Get or create an attempt object (we still need this for the attempt ID,
     # though the submission API might create a new one if it's the first submission)